@@ -0,0 +1,297 @@
+"""
+石块生成器规模基准测试（无界面运行）
+
+用法：
+    blender -b --factory-startup --python benchmarks/stone_scale_benchmark.py -- \
+        --output stone_benchmark.json
+
+可选参数（均在 "--" 之后）：
+    --counts 100,1000,5000,50000    石块数量
+    --faces 1000,10000,100000,1000000    合成地形面数
+    --dist-modes 1,2,3               分布模式（1=自动平面 2=选中对象 3=投影）
+    --copy-modes LINKED,INDEPENDENT,INSTANCED
+    --output PATH                    结果JSON路径
+
+每组参数在独立的 Blender 子进程中运行（进程峰值内存互不影响）：
+- 计时：cold（清空生成集合后首次生成）与 warm（参数不变再次运行，走增量重设路径），
+  记录总耗时与算子内各阶段耗时，计时期间不开启 tracemalloc
+- 内存：清空后再各运行一次 cold / warm，用 tracemalloc 记录Python峰值内存；
+  进程峰值常驻内存（ru_maxrss）与生成前的基线一并记录，差值即该组参数的峰值增量
+"""
+import argparse
+import importlib
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import bmesh
+import bpy
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows 无 resource 模块
+    resource = None
+
+# 插件目录 = 本脚本所在目录的上一级，按目录名作为包名导入
+ADDON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ADDON_NAME = os.path.basename(ADDON_DIR)
+
+DEFAULT_COUNTS = [100, 1000, 5000, 50000]
+DEFAULT_FACES = [1000, 10000, 100000, 1000000]
+DEFAULT_DIST_MODES = ["1", "2", "3"]
+DEFAULT_COPY_MODES = ["LINKED", "INDEPENDENT", "INSTANCED"]
+
+TERRAIN_NAME = "Benchmark_Terrain"
+
+
+# ==================== 1. 参数与插件注册 ====================
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description="Stone generator scale benchmark")
+    parser.add_argument("--counts", default=",".join(map(str, DEFAULT_COUNTS)))
+    parser.add_argument("--faces", default=",".join(map(str, DEFAULT_FACES)))
+    parser.add_argument("--dist-modes", default=",".join(DEFAULT_DIST_MODES))
+    parser.add_argument("--copy-modes", default=",".join(DEFAULT_COPY_MODES))
+    parser.add_argument("--output", default="stone_benchmark.json")
+    # 内部参数：子进程只运行一组参数，结果写入 --result
+    parser.add_argument("--case", default=None)
+    parser.add_argument("--result", default=None)
+    args = parser.parse_args(argv)
+    args.counts = [int(value) for value in args.counts.split(",") if value]
+    args.faces = [int(value) for value in args.faces.split(",") if value]
+    args.dist_modes = [value for value in args.dist_modes.split(",") if value]
+    args.copy_modes = [value for value in args.copy_modes.split(",") if value]
+    return args
+
+def register_addon():
+    """按插件目录名导入并注册（--factory-startup 下插件未启用）"""
+    parent = os.path.dirname(ADDON_DIR)
+    if parent not in sys.path:
+        sys.path.insert(0, parent)
+    addon = importlib.import_module(ADDON_NAME)
+    addon.register()
+    return addon
+
+
+# ==================== 2. 场景准备 ====================
+def reset_scene():
+    """删除出厂场景中的默认对象"""
+    bpy.data.batch_remove(list(bpy.data.objects))
+
+def create_terrain(face_count):
+    """
+    创建约 face_count 个面的合成地形（网格 + 多频正弦起伏），顶点高度用 foreach_set 批量写入
+    """
+    existing = bpy.data.objects.get(TERRAIN_NAME)
+    if existing:
+        mesh = existing.data
+        bpy.data.objects.remove(existing)
+        bpy.data.meshes.remove(mesh)
+
+    segments = max(int(math.sqrt(face_count)), 1)
+    mesh = bpy.data.meshes.new(TERRAIN_NAME)
+    bm = bmesh.new()
+    bmesh.ops.create_grid(bm, x_segments=segments, y_segments=segments, size=20.0)
+    bm.to_mesh(mesh)
+    bm.free()
+
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    co = co.reshape(-1, 3)
+    co[:, 2] = (
+        np.sin(co[:, 0] * 0.3) * 1.5
+        + np.cos(co[:, 1] * 0.45) * 1.0
+        + np.sin((co[:, 0] + co[:, 1]) * 1.7) * 0.2
+    )
+    mesh.vertices.foreach_set("co", co.ravel())
+    mesh.update()
+
+    terrain = bpy.data.objects.new(TERRAIN_NAME, mesh)
+    bpy.context.scene.collection.objects.link(terrain)
+    return terrain
+
+def select_surface(terrain):
+    """模式2/3：地形设为唯一选中对象和活动对象"""
+    view_layer = bpy.context.view_layer
+    for obj in bpy.context.selected_objects:
+        obj.select_set(False)
+    terrain.select_set(True)
+    view_layer.objects.active = terrain
+
+
+# ==================== 3. 单次运行与测量 ====================
+def peak_rss_mb():
+    """进程峰值常驻内存（MB）；Linux单位为KB，macOS为字节"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024.0 * 1024.0) if sys.platform == "darwin" else peak / 1024.0
+
+def count_generated_stones(collection):
+    """统计生成集合中的石块数量（逐对象模式数对象，实例模式数点）"""
+    if collection is None:
+        return 0
+    stones = 0
+    for obj in collection.objects:
+        if obj.get("stone_instancer"):
+            stones += len(obj.data.vertices)
+        elif obj.get("stone_index") is not None:
+            stones += 1
+    return stones
+
+def run_generate(collection_tools, trace_memory=False):
+    """
+    运行一次生成算子，返回测量结果
+    - trace_memory=False：只计时（tracemalloc 会拖慢每次Python内存分配，计时与内存分开测量）
+    - trace_memory=True：只记录Python峰值内存
+    """
+    if trace_memory:
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+    start = time.perf_counter()
+    try:
+        result = bpy.ops.mesh.generate_stone()
+        status = "+".join(sorted(result))
+    except RuntimeError as error:
+        status = f"ERROR: {error}"
+    wall = time.perf_counter() - start
+    if trace_memory:
+        _current, python_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return {"status": status, "python_peak_mb": python_peak / (1024.0 * 1024.0)}
+
+    collection = collection_tools.find_generated_collection(bpy.context.scene, "STONE")
+    stages = {}
+    if collection is not None and "stone_stage_timings" in collection:
+        stages = {name: seconds * 1000.0 for name, seconds in collection["stone_stage_timings"].to_dict().items()}
+
+    return {
+        "status": status,
+        "wall_ms": wall * 1000.0,
+        "stages_ms": stages,
+        "placed": count_generated_stones(collection),
+    }
+
+def run_case(collection_tools, case):
+    """
+    单组参数：清空后 cold / warm 各计时一次，再清空后 cold / warm 各测一次Python峰值内存
+    进程峰值常驻内存在本进程内只增不减，因此每组参数独占一个子进程
+    """
+    rss_baseline = peak_rss_mb()
+    bpy.ops.object.clear_generated(generator="STONE")
+    results = []
+    for phase in ("cold", "warm"):
+        measurement = run_generate(collection_tools)
+        measurement.update(case)
+        measurement["phase"] = phase
+        results.append(measurement)
+
+    bpy.ops.object.clear_generated(generator="STONE")
+    for measurement in results:
+        memory = run_generate(collection_tools, trace_memory=True)
+        measurement["python_peak_mb"] = memory["python_peak_mb"]
+
+    rss_peak = peak_rss_mb()
+    for measurement in results:
+        measurement["rss_baseline_mb"] = rss_baseline
+        measurement["max_rss_mb"] = rss_peak
+        measurement["max_rss_delta_mb"] = None if rss_peak is None else rss_peak - rss_baseline
+        print(
+            f"[stone-benchmark] faces={case['terrain_faces']} mode={case['dist_mode']} "
+            f"copy={case['copy_mode']} count={case['count']} {measurement['phase']}: "
+            f"{measurement['wall_ms']:.1f}ms placed={measurement['placed']} {measurement['status']}"
+        )
+    return results
+
+def run_single_case(case):
+    """子进程入口：注册插件、准备地形与参数后运行一组参数"""
+    register_addon()
+    collection_tools = importlib.import_module(f"{ADDON_NAME}.ultrs.generated_collection_tools")
+    scene = bpy.context.scene
+    reset_scene()
+
+    terrain_faces = None
+    if case["face_count"] is not None:
+        terrain = create_terrain(case["face_count"])
+        select_surface(terrain)
+        terrain_faces = len(terrain.data.polygons)
+
+    scene.stone_dist_mode = case["dist_mode"]
+    scene.stone_copy_mode = case["copy_mode"]
+    scene.stone_count = case["count"]
+    return run_case(collection_tools, {
+        "dist_mode": case["dist_mode"],
+        "copy_mode": case["copy_mode"],
+        "count": case["count"],
+        "terrain_faces": terrain_faces,
+    })
+
+def spawn_case(case):
+    """在新的 Blender 子进程中运行一组参数，读取其结果"""
+    with tempfile.TemporaryDirectory() as folder:
+        result_path = os.path.join(folder, "case.json")
+        command = [
+            bpy.app.binary_path, "-b", "--factory-startup", "--python", os.path.abspath(__file__), "--",
+            "--case", json.dumps(case), "--result", result_path,
+        ]
+        completed = subprocess.run(command)
+        if completed.returncode != 0 or not os.path.exists(result_path):
+            print(f"[stone-benchmark] case failed: {case}")
+            return [dict(case, status=f"ERROR: exit code {completed.returncode}")]
+        with open(result_path, encoding="utf-8") as handle:
+            return json.load(handle)
+
+
+# ==================== 4. 参数扫描 ====================
+def main():
+    args = parse_args()
+    if args.case is not None:
+        runs = run_single_case(json.loads(args.case))
+        with open(args.result, "w", encoding="utf-8") as handle:
+            json.dump(runs, handle)
+        return
+
+    addon = register_addon()
+    stone_tools = importlib.import_module(f"{ADDON_NAME}.ultrs.generate_stone_tools")
+
+    runs = []
+    for dist_mode in args.dist_modes:
+        # 模式1使用自动平面，与地形面数无关，只测一遍
+        face_counts = [None] if dist_mode == "1" else args.faces
+        for face_count in face_counts:
+            for copy_mode in args.copy_modes:
+                for count in args.counts:
+                    # 逐对象复制模式有数量上限
+                    if copy_mode != "INSTANCED" and count > stone_tools.MAX_OBJECT_STONES:
+                        continue
+                    runs.extend(spawn_case({
+                        "dist_mode": dist_mode,
+                        "copy_mode": copy_mode,
+                        "count": count,
+                        "face_count": face_count,
+                    }))
+
+    report = {
+        "addon": ADDON_NAME,
+        "addon_version": ".".join(map(str, addon.bl_info["version"])),
+        "blender_version": bpy.app.version_string,
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "runs": runs,
+    }
+    output = os.path.abspath(args.output)
+    with open(output, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2, ensure_ascii=False)
+    print(f"[stone-benchmark] wrote {len(runs)} runs to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -135,7 +135,140 @@ translations = {
         "Selected object has no faces!": "选中对象没有面！",
         "Failed to get face data from auto-created plane!": "无法获取自动创建平面的面数据！",
         "Generated {i}/{total} stones": "已生成 {i}/{total} 个石块",
-        "✅ Successfully generated {count} stones on object faces!": "✅ 成功在对象面上生成 {count} 个石块！"
+        "✅ Successfully generated {count} stones on object faces!": "✅ 成功在对象面上生成 {count} 个石块！",
+        "Geometry Nodes Instances": "几何节点实例",
+        "One point cloud object instancing the stone via Geometry Nodes, supports millions of stones": "单个点云对象通过几何节点实例化石块，支持百万级石块",
+        "Object copy modes support at most {max} stones, use Geometry Nodes Instances for more!": "对象复制模式最多支持 {max} 个石块，更多数量请使用几何节点实例模式！",
+        "Stage timings: {stages} (total {total:.0f}ms)": "阶段耗时：{stages}（总计 {total:.0f}ms）",
+        "Sampling Pattern": "采样方式",
+        "How stone positions are sampled on the faces": "石块位置在面上的采样方式",
+        "Random (Area Weighted)": "随机（按面积加权）",
+        "Independent random points, larger faces receive more stones": "独立随机点，面积越大的面分到的石块越多",
+        "Poisson Disk (Even Spacing)": "泊松盘（均匀间距）",
+        "Blue-noise points keeping a minimum spacing derived from base size and maximum scale": "保持最小间距的蓝噪声点（由基础尺寸和最大缩放推导）",
+        "Minimum spacing {spacing:.2f} only fits {placed} of {count} stones": "最小间距 {spacing:.2f} 下仅能放置 {placed}/{count} 个石块",
+        "Seed": "随机种子",
+        "Random seed for stone shapes and placement (same seed reproduces the same result)": "石块形状与摆放的随机种子（相同种子得到相同结果）",
+        "Shape Variants": "形状变体数",
+        "Number of distinct stone shapes built once and shared by all stones": "只构建一次、被所有石块共享的不同石块形状数量",
+        "Stones: {reused} re-posed, {added} added, {removed} removed": "石块：原地更新 {reused} 个，新增 {added} 个，删除 {removed} 个",
+        "Subdivisions": "细分级别",
+        "Icosphere subdivisions of each stone shape (higher = more surface detail)": "每个石块形状的二十面球细分级别（越高表面细节越多）",
+        "Clear Generated Objects": "清除生成的对象",
+        "Delete everything the generator created (only its own collection is touched)": "删除生成器创建的所有内容（只处理其专属集合）",
+        "Generator": "生成器",
+        "Stones created by the stone generator": "石块生成器创建的石块",
+        "Walls created by the maze generator": "迷宫生成器创建的墙体",
+        "Nothing to clear!": "没有可清除的内容！",
+        "Removed {count} generated objects": "已删除 {count} 个生成的对象",
+        "Clear Stones": "清除石块",
+        "Clear Maze": "清除迷宫",
+        "Project onto Selected Surfaces": "投影到选中表面",
+        "Cast rays straight down onto all selected mesh objects (BVH) and place stones at the highest hit": "向所有选中网格对象竖直向下投射射线（BVH），在最高命中点放置石块",
+        "Projection Region": "投射区域",
+        "XY region that rays are cast from": "射线投射的XY区域",
+        "Surface Bounds": "表面包围盒",
+        "Combined XY bounds of all selected surfaces": "所有选中表面合并的XY包围盒",
+        "Around 3D Cursor": "3D游标周围",
+        "Square region centered on the 3D cursor": "以3D游标为中心的正方形区域",
+        "Region Size": "区域尺寸",
+        "Side length of the square projection region around the 3D cursor": "3D游标周围正方形投射区域的边长",
+        "Please select at least one mesh surface!": "请至少选择一个网格表面！",
+        "Only {placed} of {count} stones hit a surface in the projection region": "投射区域内仅有 {placed}/{count} 个石块命中表面",
+        "Mode 3: Select one or more meshes → Project stones straight down onto them": "模式3：选择一个或多个网格 → 将石块竖直投影到其上",
+        "Random (No Overlap)": "随机（不重叠）",
+        "Random points, rejecting stones whose bounding radius (base size × scale) overlaps an already placed stone": "随机点，包围半径（基础尺寸 × 缩放）与已放置石块重叠的候选点将被剔除",
+        "Retry Budget": "重试预算",
+        "Candidate positions tried per stone before giving up (Poisson / No Overlap)": "每个石块放弃前最多尝试的候选位置数（泊松盘 / 不重叠）",
+        "Overlap check rejected {rejected} candidate positions": "重叠检测剔除了 {rejected} 个候选位置",
+        "Only {placed} of {count} stones fit without overlapping (retry budget exhausted)": "仅能无重叠放置 {placed}/{count} 个石块（重试预算已用尽）",
+        "Density Source": "密度来源",
+        "Weight source that makes stones cluster or thin out on the surface": "使石块在表面上聚集或稀疏的权重来源",
+        "Uniform": "均匀",
+        "Density depends on face area only": "密度仅取决于面面积",
+        "Vertex Group": "顶点组",
+        "Use the weights of a vertex group": "使用顶点组权重",
+        "Color Attribute": "颜色属性",
+        "Use the brightness of a color attribute": "使用颜色属性的亮度",
+        "Image Texture": "图像纹理",
+        "Use the brightness of an image sampled at the face UVs": "使用按面UV采样的图像亮度",
+        "Vertex group whose weights control stone density": "其权重控制石块密度的顶点组",
+        "Color attribute whose brightness controls stone density": "其亮度控制石块密度的颜色属性",
+        "Density Image": "密度图像",
+        "Image whose brightness (sampled with the active UV map) controls stone density": "其亮度（按活动UV贴图采样）控制石块密度的图像",
+        "Invert Density": "反转密度",
+        "Place more stones where the weight is low": "在权重低的位置放置更多石块",
+        "Density source not found on {name}, using uniform density": "在 {name} 上未找到密度来源，改用均匀密度",
+        "Density is zero everywhere on {name}, using uniform density": "{name} 上的密度处处为0，改用均匀密度",
+        "Minimum Slope": "最小坡度",
+        "Faces flatter than this angle (from world up) receive no stones": "比此角度（相对世界向上方向）更平缓的面不放置石块",
+        "Maximum Slope": "最大坡度",
+        "Faces steeper than this angle (from world up) receive no stones, above 90° are overhangs": "比此角度（相对世界向上方向）更陡的面不放置石块，大于90°为倒悬面",
+        "Limit Altitude": "限制高度",
+        "Only place stones on faces whose world Z lies within the altitude range": "仅在世界Z坐标位于高度范围内的面上放置石块",
+        "Minimum Altitude": "最低高度",
+        "Lowest world Z that receives stones": "放置石块的最低世界Z坐标",
+        "Maximum Altitude": "最高高度",
+        "Highest world Z that receives stones": "放置石块的最高世界Z坐标",
+        "Facing Direction": "朝向方向",
+        "World direction the face normals are compared with": "与面法线比较的世界方向",
+        "Facing Angle": "朝向角度",
+        "Maximum angle between face normal and facing direction (180° disables the filter)": "面法线与朝向方向的最大夹角（180°表示不过滤）",
+        "No faces pass the slope / altitude / facing filters!": "没有面通过坡度/高度/朝向过滤！",
+        "Surface Filters": "表面过滤",
+        "Min Slope": "最小坡度",
+        "Max Slope": "最大坡度",
+        "Min Z": "最低Z",
+        "Max Z": "最高Z",
+        "Generate Stones (Time-Sliced)": "生成石块（分帧）",
+        "Generate stones in small time-budgeted batches with a progress bar, press Esc to cancel and roll back": "按时间预算分小批生成石块并显示进度条，按Esc取消并回滚",
+        "Stone generation cancelled, {count} partial stones removed": "已取消石块生成，删除了 {count} 个未完成的石块",
+        "Generate with Progress (Esc to Cancel)": "带进度生成（Esc取消）",
+        "Maze walls built in {seconds:.2f}s": "迷宫墙体生成耗时 {seconds:.2f} 秒",
+        "Output Mode": "输出模式",
+        "How the maze walls are written to the scene": "迷宫墙体写入场景的方式",
+        "Wall Objects": "墙体对象",
+        "One object per wall, all sharing a single wall mesh": "每面墙一个对象，全部共享同一墙体网格",
+        "Single Merged Mesh": "单个合并网格",
+        "All walls in one mesh, addressable per wall through the maze_row / maze_col / maze_edge face attributes": "全部墙体在一个网格中，可通过 maze_row / maze_col / maze_edge 面属性按墙体区分",
+        "Weld Coincident Vertices": "合并重合顶点",
+        "Merged maze mesh: {vertices} vertices, {faces} faces": "合并迷宫网格：{vertices} 个顶点，{faces} 个面",
+        "Share Walls Between Cells": "相邻单元格共享墙体",
+        "Center walls on the cell borders and emit each shared border only once (otherwise every cell gets its own inset walls)": "墙体居中于单元格边界，共享边界只生成一次（否则每个单元格各自生成内缩墙体）",
+        "Dropped {count} duplicate shared walls": "去除了 {count} 面重复的共享墙体",
+        "Carve Passages": "雕刻通道",
+        "Carve a perfect maze (randomized Kruskal) so every cell is reachable through exactly one path": "雕刻完美迷宫（随机Kruskal），每个单元格之间有且仅有一条路径",
+        "Maze Seed": "迷宫种子",
+        "Random seed of the carved layout, the same seed reproduces the same maze": "雕刻布局的随机种子，相同种子生成相同迷宫",
+        "Carved {count} passages": "雕刻了 {count} 条通道",
+        "Number of edges per cell (3=triangle, 4=quad, 6=hexagon lattices tile seamlessly)": "每个单元格的边数（3=三角形、4=四边形、6=六边形晶格可无缝铺满）",
+        "{edges}-sided cells cannot tile the plane, cells are placed on a square grid without shared borders": "{edges} 边形单元格无法铺满平面，单元格按正方形网格放置且不共享边界",
+        "Merge Straight Walls": "合并直线墙体",
+        "Merge runs of collinear, touching walls into single long walls (fewer objects and hidden end faces). Merged and chunked meshes address a run by its first and last wall through the maze_row / maze_col / maze_edge and maze_row_end / maze_col_end / maze_edge_end face attributes": "将首尾相接的共线墙体合并为一面长墙（减少对象数和被遮挡的端面）。合并网格与分块输出中，每段墙通过 maze_row / maze_col / maze_edge 与 maze_row_end / maze_col_end / maze_edge_end 面属性按首尾墙体定位",
+        "Merged {before} walls into {after} straight runs": "将 {before} 面墙合并为 {after} 段直墙",
+        "Chunked Merged Meshes": "分块合并网格",
+        "One merged mesh per square block of cells, so chunks can be culled and only changed chunks are rebuilt": "每个方形单元格块一个合并网格，便于视锥剔除，重新生成时只重建变化的分块",
+        "Chunk Size": "分块大小",
+        "Cells per chunk side (each chunk holds N × N cells)": "每个分块边长的单元格数（每块包含 N × N 个单元格）",
+        "Merge wall vertices that coincide across cell boundaries (merged meshes only)": "合并跨单元格边界重合的墙体顶点（仅合并网格模式）",
+        "Chunks: {rebuilt} rebuilt, {kept} unchanged, {removed} removed": "分块：重建 {rebuilt} 个，未变化 {kept} 个，删除 {removed} 个",
+        "Solution Path": "解路径",
+        "Geometry used for the solved path": "解路径使用的几何类型",
+        "Curve": "曲线",
+        "A single poly curve through the cell centers, beveled to the path width": "穿过单元格中心的单条多段线曲线，按路径宽度倒角",
+        "Mesh Strip": "网格条带",
+        "A flat ribbon mesh of the path width lying on the maze floor": "平铺在迷宫地面上、宽度为路径宽度的条带网格",
+        "Path Width": "路径宽度",
+        "Width of the solved path (meters)": "解路径的宽度（米）",
+        "Solve Maze": "求解迷宫",
+        "Find the path from the first to the last cell of the carved maze and add it as a curve or mesh strip": "求出已雕刻迷宫从第一个单元格到最后一个单元格的路径，并生成为曲线或网格条带",
+        "Generate a carved maze first!": "请先生成已雕刻通道的迷宫！",
+        "Stored maze walls do not match the maze layout, regenerate the maze": "存储的迷宫墙体与迷宫布局不一致，请重新生成迷宫",
+        "No path between the first and last cell": "第一个与最后一个单元格之间不存在路径",
+        "Path length: {steps} steps, {dead_ends} dead ends": "路径长度：{steps} 步，死胡同 {dead_ends} 个",
+        "Path length: {steps} steps ({length:.2f}m), {dead_ends} dead ends, solved in {ms:.0f}ms": "路径长度：{steps} 步（{length:.2f}米），死胡同 {dead_ends} 个，求解耗时 {ms:.0f}毫秒",
+        "Walls: {created} created, {kept} unchanged, {removed} removed": "墙体：新建 {created} 面，未变化 {kept} 面，删除 {removed} 面",
+        "Skipped surfaces with a zero scale axis: {names}": "已跳过缩放轴为0的表面：{names}"
     },
     "ja_JP": {
 		  },
@@ -274,6 +407,139 @@ translations = {
         "Selected object has no faces!": "選択したオブジェクトに面がありません！",
         "Failed to get face data from auto-created plane!": "自動作成した平面の面データを取得できません！",
         "Generated {i}/{total} stones": "{i}/{total} 個の石を生成しました",
-        "✅ Successfully generated {count} stones on object faces!": "✅ オブジェクトの面に {count} 個の石を生成しました！"
+        "✅ Successfully generated {count} stones on object faces!": "✅ オブジェクトの面に {count} 個の石を生成しました！",
+        "Geometry Nodes Instances": "ジオメトリノードインスタンス",
+        "One point cloud object instancing the stone via Geometry Nodes, supports millions of stones": "1つの点群オブジェクトがジオメトリノードで石をインスタンス化（数百万個に対応）",
+        "Object copy modes support at most {max} stones, use Geometry Nodes Instances for more!": "オブジェクトコピーモードは最大 {max} 個まで対応、それ以上はジオメトリノードインスタンスを使用してください！",
+        "Stage timings: {stages} (total {total:.0f}ms)": "ステージ別時間：{stages}（合計 {total:.0f}ms）",
+        "Sampling Pattern": "サンプリング方式",
+        "How stone positions are sampled on the faces": "面上での石の位置のサンプリング方法",
+        "Random (Area Weighted)": "ランダム（面積加重）",
+        "Independent random points, larger faces receive more stones": "独立したランダム点、大きな面ほど多くの石を配置",
+        "Poisson Disk (Even Spacing)": "ポアソンディスク（均等間隔）",
+        "Blue-noise points keeping a minimum spacing derived from base size and maximum scale": "ベースサイズと最大スケールから求めた最小間隔を保つブルーノイズ点",
+        "Minimum spacing {spacing:.2f} only fits {placed} of {count} stones": "最小間隔 {spacing:.2f} では {count} 個中 {placed} 個のみ配置可能",
+        "Seed": "シード",
+        "Random seed for stone shapes and placement (same seed reproduces the same result)": "石の形状と配置の乱数シード（同じシードで同じ結果を再現）",
+        "Shape Variants": "形状バリエーション数",
+        "Number of distinct stone shapes built once and shared by all stones": "一度だけ作成され全ての石で共有される形状の数",
+        "Stones: {reused} re-posed, {added} added, {removed} removed": "石：{reused} 個を再配置、{added} 個を追加、{removed} 個を削除",
+        "Subdivisions": "細分化レベル",
+        "Icosphere subdivisions of each stone shape (higher = more surface detail)": "各石形状のICO球の細分化レベル（高いほど表面が詳細）",
+        "Clear Generated Objects": "生成オブジェクトを削除",
+        "Delete everything the generator created (only its own collection is touched)": "ジェネレーターが作成したものをすべて削除（専用コレクションのみ対象）",
+        "Generator": "ジェネレーター",
+        "Stones created by the stone generator": "石ジェネレーターが作成した石",
+        "Walls created by the maze generator": "迷宮ジェネレーターが作成した壁",
+        "Nothing to clear!": "削除するものがありません！",
+        "Removed {count} generated objects": "{count} 個の生成オブジェクトを削除しました",
+        "Clear Stones": "石を削除",
+        "Clear Maze": "迷宮を削除",
+        "Project onto Selected Surfaces": "選択したサーフェスに投影",
+        "Cast rays straight down onto all selected mesh objects (BVH) and place stones at the highest hit": "選択した全メッシュに真下へレイを投射（BVH）し、最も高いヒット位置に石を配置",
+        "Projection Region": "投影範囲",
+        "XY region that rays are cast from": "レイを投射するXY範囲",
+        "Surface Bounds": "サーフェスの範囲",
+        "Combined XY bounds of all selected surfaces": "選択した全サーフェスを合わせたXY範囲",
+        "Around 3D Cursor": "3Dカーソル周辺",
+        "Square region centered on the 3D cursor": "3Dカーソルを中心とした正方形の範囲",
+        "Region Size": "範囲サイズ",
+        "Side length of the square projection region around the 3D cursor": "3Dカーソル周辺の正方形投影範囲の一辺の長さ",
+        "Please select at least one mesh surface!": "メッシュサーフェスを1つ以上選択してください！",
+        "Only {placed} of {count} stones hit a surface in the projection region": "投影範囲内でサーフェスに当たった石は {placed}/{count} 個のみです",
+        "Mode 3: Select one or more meshes → Project stones straight down onto them": "モード3：1つ以上のメッシュを選択 → 石を真下に投影",
+        "Random (No Overlap)": "ランダム（重なりなし）",
+        "Random points, rejecting stones whose bounding radius (base size × scale) overlaps an already placed stone": "ランダムな点。境界半径（基本サイズ × スケール）が配置済みの石と重なる候補は除外",
+        "Retry Budget": "リトライ回数",
+        "Candidate positions tried per stone before giving up (Poisson / No Overlap)": "石1つあたり諦めるまでに試す候補位置の数（ポアソン / 重なりなし）",
+        "Overlap check rejected {rejected} candidate positions": "重なりチェックで {rejected} 個の候補位置を除外しました",
+        "Only {placed} of {count} stones fit without overlapping (retry budget exhausted)": "重ならずに配置できた石は {placed}/{count} 個のみです（リトライ回数を使い切りました）",
+        "Density Source": "密度ソース",
+        "Weight source that makes stones cluster or thin out on the surface": "石を表面上で密集・まばらにする重みのソース",
+        "Uniform": "均一",
+        "Density depends on face area only": "密度は面の面積のみに依存",
+        "Vertex Group": "頂点グループ",
+        "Use the weights of a vertex group": "頂点グループのウェイトを使用",
+        "Color Attribute": "カラー属性",
+        "Use the brightness of a color attribute": "カラー属性の明るさを使用",
+        "Image Texture": "画像テクスチャ",
+        "Use the brightness of an image sampled at the face UVs": "面のUVでサンプリングした画像の明るさを使用",
+        "Vertex group whose weights control stone density": "ウェイトで石の密度を制御する頂点グループ",
+        "Color attribute whose brightness controls stone density": "明るさで石の密度を制御するカラー属性",
+        "Density Image": "密度画像",
+        "Image whose brightness (sampled with the active UV map) controls stone density": "明るさ（アクティブなUVマップでサンプリング）で石の密度を制御する画像",
+        "Invert Density": "密度を反転",
+        "Place more stones where the weight is low": "ウェイトが低い場所により多くの石を配置",
+        "Density source not found on {name}, using uniform density": "{name} に密度ソースが見つからないため、均一密度を使用します",
+        "Density is zero everywhere on {name}, using uniform density": "{name} の密度がすべて0のため、均一密度を使用します",
+        "Minimum Slope": "最小傾斜",
+        "Faces flatter than this angle (from world up) receive no stones": "この角度（ワールド上方向から）より緩やかな面には石を配置しない",
+        "Maximum Slope": "最大傾斜",
+        "Faces steeper than this angle (from world up) receive no stones, above 90° are overhangs": "この角度（ワールド上方向から）より急な面には石を配置しない。90°超はオーバーハング",
+        "Limit Altitude": "高度を制限",
+        "Only place stones on faces whose world Z lies within the altitude range": "ワールドZが高度範囲内にある面にのみ石を配置",
+        "Minimum Altitude": "最低高度",
+        "Lowest world Z that receives stones": "石を配置する最低のワールドZ",
+        "Maximum Altitude": "最高高度",
+        "Highest world Z that receives stones": "石を配置する最高のワールドZ",
+        "Facing Direction": "向きの方向",
+        "World direction the face normals are compared with": "面の法線と比較するワールド方向",
+        "Facing Angle": "向きの角度",
+        "Maximum angle between face normal and facing direction (180° disables the filter)": "面の法線と向きの方向の最大角度（180°でフィルター無効）",
+        "No faces pass the slope / altitude / facing filters!": "傾斜・高度・向きのフィルターを通過する面がありません！",
+        "Surface Filters": "サーフェスフィルター",
+        "Min Slope": "最小傾斜",
+        "Max Slope": "最大傾斜",
+        "Min Z": "最低Z",
+        "Max Z": "最高Z",
+        "Generate Stones (Time-Sliced)": "石を生成（分割実行）",
+        "Generate stones in small time-budgeted batches with a progress bar, press Esc to cancel and roll back": "時間枠ごとの小さなバッチで石を生成し進捗バーを表示、Escでキャンセルしてロールバック",
+        "Stone generation cancelled, {count} partial stones removed": "石の生成をキャンセルし、途中の石 {count} 個を削除しました",
+        "Generate with Progress (Esc to Cancel)": "進捗付きで生成（Escでキャンセル）",
+        "Maze walls built in {seconds:.2f}s": "迷宮の壁の生成時間 {seconds:.2f} 秒",
+        "Output Mode": "出力モード",
+        "How the maze walls are written to the scene": "迷宮の壁をシーンに書き出す方法",
+        "Wall Objects": "壁オブジェクト",
+        "One object per wall, all sharing a single wall mesh": "壁ごとに1オブジェクト、すべて1つの壁メッシュを共有",
+        "Single Merged Mesh": "単一の結合メッシュ",
+        "All walls in one mesh, addressable per wall through the maze_row / maze_col / maze_edge face attributes": "すべての壁を1つのメッシュに格納、maze_row / maze_col / maze_edge 面属性で壁ごとに識別可能",
+        "Weld Coincident Vertices": "重なる頂点を結合",
+        "Merged maze mesh: {vertices} vertices, {faces} faces": "結合迷宮メッシュ：頂点 {vertices}、面 {faces}",
+        "Share Walls Between Cells": "隣接セル間で壁を共有",
+        "Center walls on the cell borders and emit each shared border only once (otherwise every cell gets its own inset walls)": "壁をセル境界の中央に配置し、共有境界は1回だけ生成（無効時は各セルが内側に独自の壁を持つ）",
+        "Dropped {count} duplicate shared walls": "重複する共有壁を {count} 枚削除しました",
+        "Carve Passages": "通路を掘る",
+        "Carve a perfect maze (randomized Kruskal) so every cell is reachable through exactly one path": "完全迷路を掘る（ランダムKruskal法）、各セルへはちょうど1本の経路で到達可能",
+        "Maze Seed": "迷路シード",
+        "Random seed of the carved layout, the same seed reproduces the same maze": "掘削レイアウトの乱数シード、同じシードで同じ迷路を再現",
+        "Carved {count} passages": "{count} 本の通路を掘りました",
+        "Number of edges per cell (3=triangle, 4=quad, 6=hexagon lattices tile seamlessly)": "セルあたりの辺の数（3=三角形、4=四角形、6=六角形の格子は隙間なく敷き詰め可能）",
+        "{edges}-sided cells cannot tile the plane, cells are placed on a square grid without shared borders": "{edges} 角形のセルは平面を敷き詰められないため、共有境界なしで正方形グリッドに配置します",
+        "Merge Straight Walls": "直線の壁を結合",
+        "Merge runs of collinear, touching walls into single long walls (fewer objects and hidden end faces). Merged and chunked meshes address a run by its first and last wall through the maze_row / maze_col / maze_edge and maze_row_end / maze_col_end / maze_edge_end face attributes": "接する同一直線上の壁を1枚の長い壁に結合（オブジェクト数と隠れた端面を削減）。結合メッシュと分割出力では、各区間を maze_row / maze_col / maze_edge と maze_row_end / maze_col_end / maze_edge_end 面属性で最初と最後の壁として識別",
+        "Merged {before} walls into {after} straight runs": "{before} 枚の壁を {after} 本の直線壁に結合しました",
+        "Chunked Merged Meshes": "チャンク分割結合メッシュ",
+        "One merged mesh per square block of cells, so chunks can be culled and only changed chunks are rebuilt": "セルの正方形ブロックごとに1つの結合メッシュを作成し、カリング可能にして変更されたチャンクのみ再構築します",
+        "Chunk Size": "チャンクサイズ",
+        "Cells per chunk side (each chunk holds N × N cells)": "チャンク一辺あたりのセル数（各チャンクは N × N セル）",
+        "Merge wall vertices that coincide across cell boundaries (merged meshes only)": "セル境界をまたいで重なる壁の頂点を結合します（結合メッシュのみ）",
+        "Chunks: {rebuilt} rebuilt, {kept} unchanged, {removed} removed": "チャンク：再構築 {rebuilt}、変更なし {kept}、削除 {removed}",
+        "Solution Path": "解答パス",
+        "Geometry used for the solved path": "解答パスに使用するジオメトリ",
+        "Curve": "カーブ",
+        "A single poly curve through the cell centers, beveled to the path width": "セル中心を通る1本のポリカーブ（パス幅でベベル）",
+        "Mesh Strip": "メッシュストリップ",
+        "A flat ribbon mesh of the path width lying on the maze floor": "迷路の床に置かれたパス幅の平らなリボンメッシュ",
+        "Path Width": "パス幅",
+        "Width of the solved path (meters)": "解答パスの幅（メートル）",
+        "Solve Maze": "迷路を解く",
+        "Find the path from the first to the last cell of the carved maze and add it as a curve or mesh strip": "彫られた迷路の最初のセルから最後のセルまでのパスを求め、カーブまたはメッシュストリップとして追加します",
+        "Generate a carved maze first!": "先に通路を彫った迷路を生成してください！",
+        "Stored maze walls do not match the maze layout, regenerate the maze": "保存された迷路の壁がレイアウトと一致しません。迷路を再生成してください",
+        "No path between the first and last cell": "最初のセルと最後のセルの間にパスがありません",
+        "Path length: {steps} steps, {dead_ends} dead ends": "パス長：{steps} ステップ、行き止まり {dead_ends} 個",
+        "Path length: {steps} steps ({length:.2f}m), {dead_ends} dead ends, solved in {ms:.0f}ms": "パス長：{steps} ステップ（{length:.2f}m）、行き止まり {dead_ends} 個、求解 {ms:.0f}ms",
+        "Walls: {created} created, {kept} unchanged, {removed} removed": "壁：作成 {created}、変更なし {kept}、削除 {removed}",
+        "Skipped surfaces with a zero scale axis: {names}": "スケール軸が0の表面をスキップしました：{names}"
     }
 }
\ No newline at end of file
@@ -13,14 +13,17 @@ from .ultrs import (
     ORIGIN_OT_to_volume,
     OBJECT_OT_rename_batch,
     MESH_OT_generate_maze_grid, #* 快速生成四壁 */
+    MESH_OT_solve_maze,
     OBJECT_OT_create_polygon,
     MESH_OT_generate_road_independent,
     MESH_OT_generate_road_linked,
     MESH_OT_generate_stone,
+    MESH_OT_generate_stone_modal,
     #ULTRS_GENERATE_stairs,
     #ULTRS_GENERATE_from_dxf, # DXF 快速生成 3D
     OBJECT_OT_create_grid_faces,
     OBJECT_OT_assign_uv_by_xy_grid,
+    OBJECT_OT_clear_generated,
 
 )
 
@@ -46,6 +49,7 @@ classes = [
     # 快速生成四壁
     GenerateMazePanel,
     MESH_OT_generate_maze_grid,     # 快速生成四壁
+    MESH_OT_solve_maze,
 
     # DXF 生成面板和操作类
 
@@ -64,6 +68,7 @@ classes = [
     # 快速生成石块
     GenerateStonePanel,
     MESH_OT_generate_stone,
+    MESH_OT_generate_stone_modal,
 
     DensePointCloudPanel, 
     DensePointCloudPanel_PointHandler,
@@ -76,7 +81,10 @@ classes = [
     # ULTRS_GENERATE_from_dxf,
 
     MaterialPanel_uv,
-    OBJECT_OT_assign_uv_by_xy_grid
+    OBJECT_OT_assign_uv_by_xy_grid,
+
+    # 清除生成结果（石块/迷宫）
+    OBJECT_OT_clear_generated
 
 ]
 
@@ -1,4 +1,5 @@
 import bpy
+import math
 from bpy.app.translations import pgettext_iface as _  # 翻译函数（核心：找不到翻译就显示原英文）
 
 # ===================== 父面板：Material 主面板 =====================
@@ -155,8 +156,10 @@ class GenerateStonePanel(bpy.types.Panel):
         box_tip.label(text=_("Operation Tips"), icon='INFO')  # 已适配翻译
         if scene.stone_dist_mode == "1":
             box_tip.label(text=_("Mode 1: Auto create plane → Generate stones on plane faces"))  # 已适配翻译
-        else:
+        elif scene.stone_dist_mode == "2":
             box_tip.label(text=_("Mode 2: Select any mesh object → Generate stones on object faces"))  # 已适配翻译
+        else:
+            box_tip.label(text=_("Mode 3: Select one or more meshes → Project stones straight down onto them"))
         
         # 核心设置
         layout.prop(scene, "stone_count", text=_("Stone Count"))  # 已适配翻译
@@ -168,14 +171,58 @@ class GenerateStonePanel(bpy.types.Panel):
         box_shape.label(text=_("Stone Shape"), icon='MESH_ICOSPHERE')  # 已适配翻译
         box_shape.prop(scene, "stone_base_size", text=_("Base Size"))  # 已适配翻译
         box_shape.prop(scene, "stone_irregularity", text=_("Irregularity"))  # 已适配翻译
+        box_shape.prop(scene, "stone_subdivisions", text=_("Subdivisions"))
+        box_shape.prop(scene, "stone_variant_count", text=_("Shape Variants"))
+        box_shape.prop(scene, "stone_seed", text=_("Seed"))
         
         # 分布设置
         box_dist = layout.box()
         box_dist.label(text=_("Distribution Settings"), icon='CONSTRAINT')  # 已适配翻译
+        box_dist.prop(scene, "stone_sampling", text=_("Sampling Pattern"))
+        if scene.stone_sampling != "RANDOM":
+            box_dist.prop(scene, "stone_overlap_retries", text=_("Retry Budget"))
+        if scene.stone_dist_mode == "3":
+            box_dist.prop(scene, "stone_project_region", text=_("Projection Region"))
+            if scene.stone_project_region == "CURSOR":
+                box_dist.prop(scene, "stone_project_size", text=_("Region Size"))
+        else:
+            box_dist.prop(scene, "stone_density_source", text=_("Density Source"))
+            density_target = context.active_object if scene.stone_dist_mode == "2" else bpy.data.objects.get("Distribution_Plane")
+            if density_target and density_target.type != 'MESH':
+                density_target = None
+            if scene.stone_density_source == "VERTEX_GROUP":
+                if density_target:
+                    box_dist.prop_search(scene, "stone_density_vertex_group", density_target, "vertex_groups", text=_("Vertex Group"))
+                else:
+                    box_dist.prop(scene, "stone_density_vertex_group", text=_("Vertex Group"))
+            elif scene.stone_density_source == "COLOR_ATTRIBUTE":
+                if density_target:
+                    box_dist.prop_search(scene, "stone_density_color_attribute", density_target.data, "color_attributes", text=_("Color Attribute"))
+                else:
+                    box_dist.prop(scene, "stone_density_color_attribute", text=_("Color Attribute"))
+            elif scene.stone_density_source == "IMAGE":
+                box_dist.template_ID(scene, "stone_density_image", open="image.open")
+            if scene.stone_density_source != "NONE":
+                box_dist.prop(scene, "stone_density_invert", text=_("Invert Density"))
         box_dist.prop(scene, "stone_height_offset", text=_("Height Offset"))  # 补充翻译key
         box_dist.prop(scene, "stone_scale_min", text=_("Minimum Scale"))  # 已适配翻译
         box_dist.prop(scene, "stone_scale_max", text=_("Maximum Scale"))  # 已适配翻译
         
+        # 表面过滤
+        box_filter = layout.box()
+        box_filter.label(text=_("Surface Filters"), icon='FILTER')
+        row = box_filter.row(align=True)
+        row.prop(scene, "stone_slope_min", text=_("Min Slope"))
+        row.prop(scene, "stone_slope_max", text=_("Max Slope"))
+        box_filter.prop(scene, "stone_use_altitude", text=_("Limit Altitude"))
+        if scene.stone_use_altitude:
+            row = box_filter.row(align=True)
+            row.prop(scene, "stone_altitude_min", text=_("Min Z"))
+            row.prop(scene, "stone_altitude_max", text=_("Max Z"))
+        box_filter.prop(scene, "stone_facing_angle", text=_("Facing Angle"))
+        if scene.stone_facing_angle < math.pi:
+            box_filter.prop(scene, "stone_facing_direction", text=_("Facing Direction"))
+        
         # 颜色设置
         box_color = layout.box()
         box_color.label(text=_("Color Settings"), icon='COLOR')  # 已适配翻译
@@ -185,6 +232,8 @@ class GenerateStonePanel(bpy.types.Panel):
         # 生成按钮
         layout.separator()
         layout.operator("mesh.generate_stone", text=_("Generate Stones on Faces"), icon='MOD_INSTANCE')  # 补充翻译key
+        layout.operator("mesh.generate_stone_modal", text=_("Generate with Progress (Esc to Cancel)"), icon='TIME')
+        layout.operator("object.clear_generated", text=_("Clear Stones"), icon='TRASH').generator = "STONE"
 
 class GenerateMazePanel(bpy.types.Panel):
     bl_label = _("Maze")  # 已适配翻译
@@ -205,7 +254,25 @@ class GenerateMazePanel(bpy.types.Panel):
         layout.prop(scene, "wall_height", text=_("Wall Height (m)"))  # 已适配翻译
         layout.prop(scene, "row_count", text=_("Row Count"))  # 已适配翻译
         layout.prop(scene, "col_count", text=_("Column Count"))  # 已适配翻译
+        layout.prop(scene, "maze_share_walls", text=_("Share Walls Between Cells"))
+        if scene.maze_share_walls:
+            layout.prop(scene, "maze_carve", text=_("Carve Passages"))
+            if scene.maze_carve:
+                layout.prop(scene, "maze_seed", text=_("Maze Seed"))
+        layout.prop(scene, "maze_merge_collinear", text=_("Merge Straight Walls"))
+        layout.prop(scene, "maze_output_mode", text=_("Output Mode"))
+        if scene.maze_output_mode == "CHUNKS":
+            layout.prop(scene, "maze_chunk_size", text=_("Chunk Size"))
+        if scene.maze_output_mode in {"MERGED", "CHUNKS"}:
+            layout.prop(scene, "maze_weld_vertices", text=_("Weld Coincident Vertices"))
         layout.operator("mesh.generate_maze_grid", text=_("Generate Maze"))  # 已适配翻译
+        layout.operator("object.clear_generated", text=_("Clear Maze"), icon='TRASH').generator = "MAZE"
+
+        box_solve = layout.box()
+        box_solve.label(text=_("Solve Maze"), icon='TRACKING')
+        box_solve.prop(scene, "maze_path_type", text=_("Solution Path"))
+        box_solve.prop(scene, "maze_path_width", text=_("Path Width"))
+        box_solve.operator("mesh.solve_maze", text=_("Solve Maze"))
 
 class GenerateRoadPanel(bpy.types.Panel):
     bl_label = _("Road")  # 已适配翻译
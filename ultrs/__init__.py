@@ -14,16 +14,18 @@ from .text_tools import OBJECT_OT_rename_batch
 
 from .generatefromdxf_tools import ULTRS_GENERATE_from_dxf
 
-from .generate_maze_tools import MESH_OT_generate_maze_grid
+from .generate_maze_tools import MESH_OT_generate_maze_grid, MESH_OT_solve_maze
 
 from .create_polygon_tools import OBJECT_OT_create_polygon
 
 from .generate_road_tools import MESH_OT_generate_road_independent, MESH_OT_generate_road_linked
 
-from .generate_stone_tools import MESH_OT_generate_stone
+from .generate_stone_tools import MESH_OT_generate_stone, MESH_OT_generate_stone_modal
 
 from .densePointCloud_panel_tools import OBJECT_OT_create_grid_faces
 
+from .generated_collection_tools import OBJECT_OT_clear_generated
+
 
 # from .generate_stairs_tools import ULTRS_GENERATE_stairs,OBJECT_OT_generate_stair_plane
 # from .fix_model_tools import OBJECT_OT_fix_model
\ No newline at end of file
@@ -1,6 +1,20 @@
 import bpy
+import bmesh
+import mathutils
 import math
+import time
+import numpy as np
+import base64
+import hashlib
 from bpy.app.translations import pgettext_iface as _  # 导入翻译函数（核心）
+from .generated_collection_tools import (
+    get_generated_collection,
+    link_generated_collection,
+    clear_generated_collection,
+    clear_generated_state,
+    find_generated_collection,
+    remove_objects,
+)
 
 # ==================== 1. 注册场景属性（改为英文基准，支持多语言）====================
 # 所有属性名/描述默认英文，套上_()翻译函数
@@ -36,43 +50,712 @@ bpy.types.Scene.col_count = bpy.props.IntProperty(
 )
 bpy.types.Scene.edge_count = bpy.props.IntProperty(
     name=_("Cell Edge Count"),
-    description=_("Number of edges per cell (4=quad, 6=hexagon, etc.)"),
+    description=_("Number of edges per cell (3=triangle, 4=quad, 6=hexagon lattices tile seamlessly)"),
     default=4,
     min=3
 )
+bpy.types.Scene.maze_share_walls = bpy.props.BoolProperty(
+    name=_("Share Walls Between Cells"),
+    description=_("Center walls on the cell borders and emit each shared border only once (otherwise every cell gets its own inset walls)"),
+    default=True
+)
+bpy.types.Scene.maze_carve = bpy.props.BoolProperty(
+    name=_("Carve Passages"),
+    description=_("Carve a perfect maze (randomized Kruskal) so every cell is reachable through exactly one path"),
+    default=True
+)
+bpy.types.Scene.maze_seed = bpy.props.IntProperty(
+    name=_("Maze Seed"),
+    description=_("Random seed of the carved layout, the same seed reproduces the same maze"),
+    default=0,
+    min=0
+)
+bpy.types.Scene.maze_merge_collinear = bpy.props.BoolProperty(
+    name=_("Merge Straight Walls"),
+    description=_("Merge runs of collinear, touching walls into single long walls (fewer objects and hidden end faces). Merged and chunked meshes address a run by its first and last wall through the maze_row / maze_col / maze_edge and maze_row_end / maze_col_end / maze_edge_end face attributes"),
+    default=True
+)
+bpy.types.Scene.maze_output_mode = bpy.props.EnumProperty(
+    name=_("Output Mode"),
+    description=_("How the maze walls are written to the scene"),
+    items=[
+        ("OBJECTS", _("Wall Objects"), _("One object per wall, all sharing a single wall mesh")),
+        ("MERGED", _("Single Merged Mesh"), _("All walls in one mesh, addressable per wall through the maze_row / maze_col / maze_edge face attributes")),
+        ("CHUNKS", _("Chunked Merged Meshes"), _("One merged mesh per square block of cells, so chunks can be culled and only changed chunks are rebuilt"))
+    ],
+    default="OBJECTS"
+)
+bpy.types.Scene.maze_chunk_size = bpy.props.IntProperty(
+    name=_("Chunk Size"),
+    description=_("Cells per chunk side (each chunk holds N × N cells)"),
+    default=16,
+    min=1
+)
+bpy.types.Scene.maze_path_type = bpy.props.EnumProperty(
+    name=_("Solution Path"),
+    description=_("Geometry used for the solved path"),
+    items=[
+        ("CURVE", _("Curve"), _("A single poly curve through the cell centers, beveled to the path width")),
+        ("MESH", _("Mesh Strip"), _("A flat ribbon mesh of the path width lying on the maze floor"))
+    ],
+    default="CURVE"
+)
+bpy.types.Scene.maze_path_width = bpy.props.FloatProperty(
+    name=_("Path Width"),
+    description=_("Width of the solved path (meters)"),
+    default=0.3,
+    min=0.001,
+    unit='LENGTH'
+)
+bpy.types.Scene.maze_weld_vertices = bpy.props.BoolProperty(
+    name=_("Weld Coincident Vertices"),
+    description=_("Merge wall vertices that coincide across cell boundaries (merged meshes only)"),
+    default=False
+)
+
+# 墙体原型网格名称（内部标识）
+MAZE_WALL_MESH_NAME = "Maze_Wall"
+# 合并输出模式的对象名称（内部标识）
+MAZE_MERGED_NAME = "Maze_Walls"
+# 分块输出：分块集合名称、分块对象名前缀、分块编号中列号所占的进制
+MAZE_CHUNK_COLLECTION_NAME = "Maze_Chunks"
+MAZE_CHUNK_PREFIX = "Maze_Chunk_"
+MAZE_CHUNK_STRIDE = 1 << 20
+# 迷宫解路径的对象名称（内部标识）与条带离地高度（米，避免与地面重叠闪烁）
+MAZE_SOLUTION_NAME = "Maze_Solution"
+MAZE_PATH_LIFT = 0.01
+# 随机流编号：迷宫雕刻
+MAZE_STREAM_CARVE = 0
+# 雕刻权重分块哈希的块大小（限制 uint64 临时数组的峰值内存）
+MAZE_HASH_CHUNK = 1 << 20
+# 共线合并的方向角量化容差（弧度）
+MAZE_ANGLE_TOLERANCE = 1e-6
+# 合并顶点的量化容差（米）
+MAZE_WELD_TOLERANCE = 1e-4
+
+# 单位立方体（边长2）的顶点与朝外的四边形面，合并网格按墙体批量变换
+WALL_BOX_CORNERS = np.array([
+    (-1, -1, -1), (1, -1, -1), (1, 1, -1), (-1, 1, -1),
+    (-1, -1, 1), (1, -1, 1), (1, 1, 1), (-1, 1, 1),
+], dtype=np.float64)
+WALL_BOX_FACES = np.array([
+    (0, 3, 2, 1), (4, 5, 6, 7), (0, 1, 5, 4),
+    (1, 2, 6, 5), (2, 3, 7, 6), (3, 0, 4, 7),
+], dtype=np.int64)
 
 # ==================== 2. 核心工具函数（无文本，无需修改）====================
-def calculate_cell_center(row, col, rows, cols, cell_len, wall_height):
-    ccx = cell_len
-    ccy = cell_len
-    offset_x = (col - (cols - 1) / 2) * ccx
-    offset_y = (row - (rows - 1) / 2) * ccy
-    cell_center_z = wall_height / 2
-    return (offset_x, offset_y, cell_center_z)
-
-def calculate_edge_params(cell_center, edge_index, edges, cell_len, wall_thk, wall_h):
-    center_x, center_y, center_z = cell_center
-    edges_degree = 360 / edges
-    cell_half_length = cell_len / 2
-    edges_offset = wall_thk / 2
-
-    edge_rad = math.radians(edge_index * edges_degree)
+# 可无缝铺满平面的正多边形边数：三角形 / 正方形 / 六边形
+TILING_EDGE_COUNTS = (3, 4, 6)
+
+def get_cell_apothem(edges, cell_len):
+    """正多边形单元格（边长cell_len）的边心距：墙体到单元格中心的距离"""
+    return cell_len / (2 * math.tan(math.pi / edges))
+
+def get_cell_centers(row_index, col_index, cell_len, wall_height, edges=4):
+    """
+    按晶格计算指定单元格的中心（边长为cell_len的正多边形），只依赖行列号
+    - 正方形：行列间距均为边长
+    - 六边形（平顶）：列间距1.5倍边长，行间距√3倍边长，奇数列上移半行
+    - 三角形：列间距半个边长，行间距为三角形高，(行+列)为偶数时尖角朝上、为奇数时朝下
+    - 其它边数无法铺满平面，按边心距放在正方形网格上
+    - 晶格以第0行第0列单元格为原点（角点锚定），增减行列时已有单元格位置不变
+    返回 (centers, orientation)：中心点 (C, 3)、单元格旋转弧度 (C,)
+    """
+    orientation = np.zeros(len(row_index))
+
+    if edges == 6:
+        x = col_index * (1.5 * cell_len)
+        y = (row_index + (col_index % 2) * 0.5) * (math.sqrt(3) * cell_len)
+    elif edges == 3:
+        height = math.sqrt(3) / 2 * cell_len
+        up = (row_index + col_index) % 2 == 0
+        x = col_index * (cell_len / 2)
+        y = row_index * height + np.where(up, height / 3, height * 2 / 3)
+        orientation[up] = math.pi
+    else:
+        pitch = cell_len if edges == 4 else 2 * get_cell_apothem(edges, cell_len)
+        x = col_index * pitch
+        y = row_index * pitch
+
+    centers = np.column_stack((x, y, np.full(len(row_index), wall_height / 2)))
+    return centers, orientation
+
+def calculate_maze_walls(rows, cols, edges, cell_len, wall_thk, wall_h, shared=False, wall_cell=None, wall_edge=None):
+    """
+    向量化计算墙体的位置、旋转和缩放
+    - 墙体到单元格中心的距离取正多边形的实际边心距（三角形/六边形晶格精确贴合）
+    - shared=True 时墙体居中于单元格边界，两端按多边形内角延长（转角闭合），
+      相邻单元格的同一边界墙完全重合
+    - 默认计算全部 单元格 × 边；给出 wall_cell / wall_edge 时只计算这些墙体
+      （雕刻后只为保留的墙体生成几何）
+    返回墙体表（NumPy数组字典），每行一面墙：
+    - center (W, 3)、rotation (W,) 绕Z轴弧度、scale (W, 3)
+    - row / col / edge / cell：墙体所属单元格行列号、边序号与单元格编号
+    """
+    if wall_cell is None:
+        # 单元格 × 边 展开为墙体（单元格优先，与原逐个生成顺序一致）
+        wall_cell = np.repeat(np.arange(rows * cols), edges)
+        wall_edge = np.tile(np.arange(edges), rows * cols)
+    row_index, col_index = np.divmod(wall_cell, cols)
+    centers, orientation = get_cell_centers(row_index, col_index, cell_len, wall_h, edges)
+
+    apothem = get_cell_apothem(edges, cell_len)
+    interior_angle = math.pi * (edges - 2) / edges
+    distance = apothem if shared else apothem - wall_thk / 2
+    half_length = cell_len / 2 + (wall_thk / 2) / math.tan(interior_angle / 2) if shared else cell_len / 2
+
+    edge_rad = np.radians(wall_edge * (360 / edges)) + orientation
     dir_rad = edge_rad + math.radians(90)
-    distance = cell_half_length - edges_offset
+    centers[:, 0] += np.cos(dir_rad) * distance
+    centers[:, 1] += np.sin(dir_rad) * distance
+
+    wall_count = len(wall_cell)
+    return {
+        "center": centers,
+        "rotation": edge_rad,
+        "scale": np.tile((half_length, wall_thk / 2, wall_h / 2), (wall_count, 1)),
+        "row": row_index,
+        "col": col_index,
+        "edge": np.asarray(wall_edge),
+        "cell": np.asarray(wall_cell),
+    }
+
+def select_walls(walls, index):
+    """按索引/掩码筛选墙体表的所有列"""
+    return {key: value[index] for key, value in walls.items()}
+
+def get_lattice_neighbors(rows, cols, edges):
+    """
+    晶格邻接：每个单元格每条边对面的单元格编号 (C, E)，外边界为 -1
+    - 只用行列号整数运算，不计算任何墙体几何
+    - 正方形网格（含无法铺满平面的边数）：边的外法线恰为 0°/90°/180°/270° 且对面单元格有反向边时共享
+    - 六边形（平顶，奇数列上移半行）：边 0/3 为上/下，边 1/2 为左上/左下，边 5/4 为右上/右下
+    - 三角形：尖角朝上的单元格边 0/1/2 为下/右/左，朝下的为上/左/右
+    - 单元格编号为 int32（每个单元格每条边 4 字节）
+    """
+    row_index, col_index = np.divmod(np.arange(rows * cols, dtype=np.int32), np.int32(cols))
+    if edges == 6:
+        odd = col_index % 2
+        offsets = [(1, 0), (odd, -1), (odd - 1, -1), (-1, 0), (odd - 1, 1), (odd, 1)]
+    elif edges == 3:
+        up = (row_index + col_index) % 2 == 0
+        offsets = [(np.where(up, -1, 1), 0), (0, np.where(up, 1, -1)), (0, np.where(up, -1, 1))]
+    else:
+        offsets = []
+        for edge in range(edges):
+            degrees = (90 + edge * 360 / edges) % 360
+            # 边数为偶数时才有反向的边与之重合
+            if edges % 2 == 0 and abs(degrees - round(degrees / 90) * 90) < 1e-9:
+                quarter = int(round(degrees / 90)) % 4
+                offsets.append([(0, 1), (1, 0), (0, -1), (-1, 0)][quarter])
+            else:
+                offsets.append(None)
+
+    neighbors = np.full((rows * cols, edges), -1, dtype=np.int32)
+    for edge, offset in enumerate(offsets):
+        if offset is None:
+            continue
+        row = row_index + offset[0]
+        col = col_index + offset[1]
+        inside = (row >= 0) & (row < rows) & (col >= 0) & (col < cols)
+        neighbors[inside, edge] = (row * cols + col)[inside]
+    return neighbors
+
+def get_lattice_walls(rows, cols, edges):
+    """
+    共享墙体的迷宫拓扑：每条边界只保留一面墙，归属编号较小的单元格
+    - 按 (单元格, 边) 顺序排列，即墙体位图的位序
+    - 邻接表取出对面单元格后立即释放，返回的三列均为 int32
+    返回 (wall_cell, wall_edge, wall_neighbor)：墙体所属单元格、边序号与
+    边界另一侧的单元格编号 (B,)（外边界为 -1）
+    """
+    neighbors = get_lattice_neighbors(rows, cols, edges)
+    owned = neighbors < 0
+    owned |= neighbors > np.arange(rows * cols, dtype=np.int32)[:, None]
+    flat = np.flatnonzero(owned)
+    del owned
+    wall_neighbor = neighbors.ravel()[flat]
+    del neighbors
+    wall_cell, wall_edge = np.divmod(flat.astype(np.int32), np.int32(edges))
+    return wall_cell, wall_edge, wall_neighbor
+
+def splitmix64(value):
+    """splitmix64 整数混合（uint64 数组，溢出按模 2^64 回绕）"""
+    value = value + np.uint64(0x9E3779B97F4A7C15)
+    value = (value ^ (value >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    value = (value ^ (value >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return value ^ (value >> np.uint64(31))
+
+def hash_columns(columns, seed=0):
+    """等长整数列依次混合为逐行 uint64 哈希（无需先拼成二维表）"""
+    value = None
+    for column in columns:
+        column = np.asarray(column, dtype=np.int64).astype(np.uint64)
+        if value is None:
+            value = np.full(len(column), seed, dtype=np.uint64)
+        value = splitmix64(value ^ column)
+    return value
+
+def hash_int_columns(columns, seed=0):
+    """整数表 (N, K) 逐行哈希为 uint64，结果只取决于行内容（与行顺序、表长度无关）"""
+    columns = np.asarray(columns, dtype=np.int64).reshape(len(columns), -1)
+    return hash_columns(columns.T, seed=seed)
+
+def carve_maze(wall_cell, wall_edge, wall_neighbor, cols, cell_count, seed):
+    """
+    随机 Kruskal 迷宫（最小生成树）：打通的内墙构成连通全部单元格的生成树
+    - 内墙权重为 (种子, 行, 列, 边序号) 的哈希，与网格大小无关：增减行列时
+      原有墙体权重不变，绝大部分通道保持不变，只有新增区域附近重新雕刻
+    - 哈希低位换成墙体序号使权重互不相同；权重互不相同时最小生成树唯一，
+      因此用 Borůvka 轮次向量化求解，结果与逐条 Kruskal + 并查集完全相同
+    - 每轮每个连通分量选出最小权重的外连内墙并合并（指针跳跃压缩），
+      随后把内墙两端收缩为分量编号并丢弃已在同一分量内的内墙，
+      共 O(log N) 轮且每轮处理的内墙越来越少，无递归、无逐墙Python循环
+    - 单元格、墙体编号均为 int32；行列号由单元格编号分块换算后直接哈希，
+      不生成 (B, 3) 的编号表；分量最小权重缓冲区只分配一次，每轮重置
+    wall_cell / wall_edge / wall_neighbor 为 get_lattice_walls 的返回值
+    返回布尔数组 alive (B,)：保留的墙体（外边界墙始终保留）
+    """
+    alive = np.ones(len(wall_cell), dtype=bool)
+    wall = np.flatnonzero(wall_neighbor >= 0).astype(np.int32)
+    if len(wall) == 0:
+        return alive
+
+    comp_a = wall_cell[wall]
+    comp_b = wall_neighbor[wall]
+    index_bits = np.uint64(max(int(len(wall) - 1).bit_length(), 1))
+    stream = hash_int_columns([[seed, MAZE_STREAM_CARVE]])[0]
+    weight = np.empty(len(wall), dtype=np.uint64)
+    for start in range(0, len(wall), MAZE_HASH_CHUNK):
+        chunk = wall[start:start + MAZE_HASH_CHUNK]
+        row, col = np.divmod(wall_cell[chunk], np.int32(cols))
+        value = hash_columns((row, col, wall_edge[chunk]), seed=stream)
+        value >>= index_bits
+        value <<= index_bits
+        value |= np.arange(start, start + len(chunk), dtype=np.uint64)
+        weight[start:start + len(chunk)] = value
+    no_edge = np.iinfo(np.uint64).max
+    labels = np.arange(cell_count, dtype=np.int32)
+    best = np.empty(cell_count, dtype=np.uint64)
+
+    while len(wall):
+        # 每个分量最小权重的外连内墙
+        best.fill(no_edge)
+        np.minimum.at(best, comp_a, weight)
+        np.minimum.at(best, comp_b, weight)
+        pick_a = best[comp_a] == weight
+        pick_b = best[comp_b] == weight
+        alive[wall[pick_a | pick_b]] = False
+
+        # 分量挂到所选内墙另一侧的分量；互选的一对以编号小者为根
+        parent = labels.copy()
+        parent[comp_a[pick_a]] = comp_b[pick_a]
+        parent[comp_b[pick_b]] = comp_a[pick_b]
+        mutual = (parent[parent] == labels) & (labels < parent)
+        parent[mutual] = labels[mutual]
+        while True:
+            grand = parent[parent]
+            if np.array_equal(grand, parent):
+                break
+            parent = grand
+
+        # 收缩：内墙两端换成所属分量，丢弃两端已在同一分量内的内墙
+        comp_a = parent[comp_a]
+        comp_b = parent[comp_b]
+        keep = comp_a != comp_b
+        # 逐个替换，旧数组立即释放（同时只多占一个数组的内存）
+        wall = wall[keep]
+        comp_a = comp_a[keep]
+        comp_b = comp_b[keep]
+        weight = weight[keep]
+
+    return alive
+
+def pack_wall_bits(alive):
+    """墙体存活位图压缩为base64字符串（每面墙1位），存储到迷宫集合"""
+    return base64.b64encode(np.packbits(alive).tobytes()).decode("ascii")
+
+def unpack_wall_bits(text, wall_count):
+    """pack_wall_bits 的逆操作"""
+    bits = np.frombuffer(base64.b64decode(text), dtype=np.uint8)
+    return np.unpackbits(bits, count=wall_count).astype(bool)
+
+def build_passage_table(wall_cell, wall_edge, wall_neighbor, alive, cell_count, edges):
+    """
+    打通的内墙 → 单元格邻接表 (C, E)（按边序号存放对面单元格，无通道为 -1）与每个单元格的通道数
+    - 墙体所属单元格写在其边序号处，对面单元格写在反向边处
+      （偶数边数的反向边为 边 + E/2，三角形晶格两侧边序号相同），一次散射写入，无排序
+    """
+    passage = ~alive & (wall_neighbor >= 0)
+    cell_a = wall_cell[passage]
+    cell_b = wall_neighbor[passage]
+    edge = wall_edge[passage]
+    table = np.full((cell_count, edges), -1, dtype=np.int32)
+    table[cell_a, edge] = cell_b
+    table[cell_b, edge if edges == 3 else (edge + edges // 2) % edges] = cell_a
+    degree = (table >= 0).sum(axis=1)
+    return table, degree
+
+def solve_maze_path(table, start, goal):
+    """
+    层同步 BFS：整层前沿一次展开（NumPy 数组），到达终点即停止
+    - 每个单元格记录首次到达的前驱，回溯得到最短路径
+    - 空位换成哨兵单元格（前驱数组末位，视为已访问），每层只需一次掩码筛选
+    返回单元格编号数组（起点 → 终点），不连通时返回空数组
+    """
+    cell_count = len(table)
+    table = np.where(table < 0, cell_count, table)
+    parent = np.full(cell_count + 1, -1, dtype=np.int64)
+    parent[cell_count] = cell_count
+    parent[start] = start
+    frontier = np.array([start], dtype=np.int64)
+    while len(frontier) and parent[goal] < 0:
+        neighbors = table[frontier]
+        fresh = parent[neighbors] < 0
+        sources = frontier[np.nonzero(fresh)[0]]
+        neighbors = neighbors[fresh]
+        parent[neighbors] = sources
+        # 同层多个前驱到达同一单元格时只保留最终写入的一个
+        frontier = neighbors[parent[neighbors] == sources]
+    if parent[goal] < 0:
+        return np.empty(0, dtype=np.int64)
+
+    path = [goal]
+    while path[-1] != start:
+        path.append(int(parent[path[-1]]))
+    return np.array(path[::-1], dtype=np.int64)
+
+def get_path_strip(points, width):
+    """折线 → 等宽条带的顶点与四边形面（拐点处取相邻两段法线的平均方向）"""
+    direction = np.diff(points[:, :2], axis=0)
+    direction /= np.linalg.norm(direction, axis=1)[:, None]
+    normal = np.column_stack((-direction[:, 1], direction[:, 0]))
+    vertex_normal = np.vstack((normal[:1], normal[:-1] + normal[1:], normal[-1:]))
+    vertex_normal /= np.linalg.norm(vertex_normal, axis=1)[:, None]
+    # 拐角处按夹角放大偏移，保持条带宽度一致
+    miter = np.einsum("ij,ij->i", vertex_normal, np.vstack((normal[:1], normal)))
+    offset = vertex_normal * (width / 2 / np.maximum(miter, 0.5))[:, None]
+
+    verts = np.empty((len(points) * 2, 3))
+    verts[0::2] = points
+    verts[1::2] = points
+    verts[0::2, :2] += offset
+    verts[1::2, :2] -= offset
+    base = np.arange(len(points) - 1) * 2
+    faces = np.column_stack((base, base + 1, base + 3, base + 2))
+    return verts, faces
+
+def build_path_object(points, name, path_type, width):
+    """解路径写入单个对象：多段线曲线（倒角成管）或平铺条带网格"""
+    if path_type == "CURVE":
+        curve = bpy.data.curves.new(name, 'CURVE')
+        curve.dimensions = '3D'
+        curve.bevel_depth = width / 2
+        spline = curve.splines.new('POLY')
+        spline.points.add(len(points) - 1)
+        coords = np.column_stack((points, np.ones(len(points))))
+        spline.points.foreach_set("co", coords.astype(np.float32).ravel())
+        return bpy.data.objects.new(name, curve)
+
+    verts, faces = get_path_strip(points, width)
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(verts))
+    mesh.vertices.foreach_set("co", verts.astype(np.float32).ravel())
+    mesh.loops.add(faces.size)
+    mesh.loops.foreach_set("vertex_index", faces.astype(np.int32).ravel())
+    mesh.polygons.add(len(faces))
+    mesh.polygons.foreach_set("loop_start", np.arange(0, faces.size, 4, dtype=np.int32))
+    mesh.update(calc_edges=True)
+    return bpy.data.objects.new(name, mesh)
+
+def merge_collinear_walls(walls, tolerance=MAZE_WELD_TOLERANCE):
+    """
+    合并同一直线上首尾相接的墙体（排序 + 扫描）
+    - 直线键：方向角（模180°）与到原点的垂直偏移，均量化为整数
+    - 按 (直线键, 起点) 排序后，起点不超过此前最远终点的墙体属于同一段，
+      段内取最小起点和最大终点得到一面长墙；去掉了内部被遮挡的端面
+    - 合并后的墙体沿用段内第一面墙的行列号和边序号，段内最后一面墙的
+      记入 row_end / col_end / edge_end 列，整段墙体仍可按首尾单元格定位
+    返回 (walls, merged_count)
+    """
+    wall_count = len(walls["rotation"])
+    if wall_count == 0:
+        return walls, 0
 
-    edge_x = center_x + math.cos(dir_rad) * distance
-    edge_y = center_y + math.sin(dir_rad) * distance
-    edge_center = (edge_x, edge_y, center_z)
+    angle = np.mod(walls["rotation"], math.pi)
+    angle_steps = round(math.pi / MAZE_ANGLE_TOLERANCE)
+    angle_key = np.rint(angle / MAZE_ANGLE_TOLERANCE).astype(np.int64) % angle_steps
+    # 接近180°而量化到0的方向角回绕为负角，保证同组墙体沿线方向一致
+    angle = np.where(angle - angle_key * MAZE_ANGLE_TOLERANCE > 1.0, angle - math.pi, angle)
+    direction = np.column_stack((np.cos(angle), np.sin(angle)))
+    center = walls["center"][:, :2]
+    offset_key = np.rint((center[:, 1] * direction[:, 0] - center[:, 0] * direction[:, 1]) / tolerance).astype(np.int64)
+    along = np.einsum("ij,ij->i", center, direction)
+    start = along - walls["scale"][:, 0]
+    end = along + walls["scale"][:, 0]
 
-    edge_rotation = edge_rad
-    scale_x = cell_half_length
-    scale_y = wall_thk / 2
-    scale_z = wall_h / 2
-    edge_scale = (scale_x, scale_y, scale_z)
+    # 直线分组（同一直线、同一高度与墙厚；分块输出时不跨块合并）
+    line_keys = np.column_stack((
+        angle_key,
+        offset_key,
+        np.rint(walls["center"][:, 2] / tolerance).astype(np.int64),
+        np.rint(walls["scale"][:, 1:] / tolerance).astype(np.int64),
+        walls.get("chunk", np.zeros(wall_count, dtype=np.int64)),
+    ))
+    order = np.lexsort((start,) + tuple(line_keys.T[::-1]))
+    line_keys = line_keys[order]
+    new_line = np.concatenate(([True], np.any(line_keys[1:] != line_keys[:-1], axis=1)))
+    line_id = np.cumsum(new_line) - 1
 
-    return edge_center, edge_rotation, edge_scale
+    # 段内最远终点的累计最大值（加上直线编号偏移，使不同直线互不影响）
+    start = start[order]
+    end = end[order]
+    extent = max(float(end.max() - start.min()), 1.0) * 4.0
+    running_end = np.maximum.accumulate(end + line_id * extent) - line_id * extent
+    new_run = new_line.copy()
+    new_run[1:] |= start[1:] > running_end[:-1] + tolerance
+    run_id = np.cumsum(new_run) - 1
+    run_count = int(run_id[-1]) + 1
 
-# ==================== 3. 优化核心：关联复制生成墙体（仅创建1个原型）====================
+    run_start = np.full(run_count, np.inf)
+    run_end = np.full(run_count, -np.inf)
+    np.minimum.at(run_start, run_id, start)
+    np.maximum.at(run_end, run_id, end)
+
+    run_head = np.flatnonzero(new_run)
+    first = order[run_head]
+    last = order[np.append(run_head[1:] - 1, wall_count - 1)]
+    merged = select_walls(walls, first)
+    for key in ("row", "col", "edge"):
+        merged[f"{key}_end"] = walls[key][last]
+    run_direction = direction[first]
+    run_offset = center[first] - np.einsum("ij,ij->i", center[first], run_direction)[:, None] * run_direction
+    merged["center"] = merged["center"].copy()
+    merged["center"][:, :2] = run_offset + run_direction * ((run_start + run_end) / 2)[:, None]
+    merged["rotation"] = angle[first]
+    merged["scale"] = merged["scale"].copy()
+    merged["scale"][:, 0] = (run_end - run_start) / 2
+    return merged, wall_count - run_count
+
+def get_wall_attributes(walls):
+    """
+    墙体表 → 面属性名与取值：每面墙所属单元格的行列号、边序号，以及合并段末端墙体的
+    （未合并的墙体末端即自身）
+    """
+    attributes = []
+    for key in ("row", "col", "edge"):
+        attributes.append((f"maze_{key}", walls[key]))
+        attributes.append((f"maze_{key}_end", walls.get(f"{key}_end", walls[key])))
+    return attributes
+
+def compute_wall_matrices(walls):
+    """由墙体表批量计算世界矩阵 (W, 4, 4)：缩放 → 绕Z旋转 → 平移"""
+    cos_r = np.cos(walls["rotation"])
+    sin_r = np.sin(walls["rotation"])
+    scale = walls["scale"]
+    matrices = np.zeros((len(cos_r), 4, 4))
+    matrices[:, 0, 0] = cos_r * scale[:, 0]
+    matrices[:, 0, 1] = -sin_r * scale[:, 1]
+    matrices[:, 1, 0] = sin_r * scale[:, 0]
+    matrices[:, 1, 1] = cos_r * scale[:, 1]
+    matrices[:, 2, 2] = scale[:, 2]
+    matrices[:, :3, 3] = walls["center"]
+    matrices[:, 3, 3] = 1.0
+    return matrices
+
+def get_wall_mesh():
+    """墙体原型网格：边长2的立方体（与缩放参数配合得到实际尺寸），所有墙体对象共享"""
+    mesh = bpy.data.meshes.new(MAZE_WALL_MESH_NAME)
+    bm = bmesh.new()
+    bmesh.ops.create_cube(bm, size=2.0)
+    bm.to_mesh(mesh)
+    bm.free()
+    return mesh
+
+def get_wall_keys(walls):
+    """墙体键：量化后的位置/旋转/缩放哈希（十六进制字符串），同一变换的墙体在任意网格大小下键相同"""
+    quantized = np.column_stack((
+        np.rint(walls["center"] / MAZE_WELD_TOLERANCE),
+        np.rint(walls["rotation"] / MAZE_ANGLE_TOLERANCE),
+        np.rint(walls["scale"] / MAZE_WELD_TOLERANCE),
+    )).astype(np.int64)
+    return [f"{value:016x}" for value in hash_int_columns(quantized).tolist()]
+
+def build_wall_objects(collection, mesh, walls, keys):
+    """
+    用 bpy.data.objects.new 批量创建共享原型网格的墙体对象并链接到迷宫集合
+    - 不经过 bpy.ops，没有逐个算子的依赖图更新与撤销开销
+    - 每个对象记录墙体键 maze_wall_key，供下次生成时增量比对
+    """
+    matrices = compute_wall_matrices(walls)
+    new_object = bpy.data.objects.new
+    link = collection.objects.link
+    Matrix = mathutils.Matrix
+    for row, col, edge, matrix, key in zip(walls["row"].tolist(), walls["col"].tolist(), walls["edge"].tolist(), matrices.tolist(), keys):
+        obj = new_object(f"Cell_R{row}_C{col}_Edge{edge}_Wall", mesh)
+        obj.matrix_world = Matrix(matrix)
+        obj["maze_wall_key"] = key
+        link(obj)
+    return len(matrices)
+
+def get_maze_layout_key(scene):
+    """除行列数外影响墙体的全部参数；与上次生成一致时才复用已有墙体对象"""
+    return ":".join(str(part) for part in (
+        scene.edge_count, round(scene.cell_length, 6), round(scene.wall_thickness, 6), round(scene.wall_height, 6),
+        scene.maze_share_walls, scene.maze_carve, scene.maze_seed, scene.maze_merge_collinear,
+    ))
+
+def prepare_maze_collection(collection, output_mode, layout_key):
+    """
+    重新生成前整理迷宫集合：清除存储的生成状态，只保留当前输出模式可复用的对象
+    - 对象模式且布局键未变：保留带墙体键的墙体对象，按键增量复用
+    - 分块模式：保留分块子集合，按分块内容摘要增量复用
+    返回可复用的墙体对象 {墙体键: 对象}
+    """
+    reuse_walls = output_mode == "OBJECTS" and collection.get("maze_layout_key") == layout_key
+    if output_mode == "MERGED" or (output_mode == "OBJECTS" and not reuse_walls):
+        clear_generated_collection(collection)
+        return {}
+
+    reusable = {}
+    stale = []
+    children = list(collection.children_recursive) if output_mode == "OBJECTS" else []
+    for obj in collection.objects:
+        key = obj.get("maze_wall_key") if reuse_walls else None
+        if key is None or key in reusable:
+            stale.append(obj)
+        else:
+            reusable[key] = obj
+    stale.extend(obj for child in children for obj in child.objects)
+    remove_objects(stale)
+    if children:
+        bpy.data.batch_remove(children)
+    clear_generated_state(collection)
+    return reusable
+
+def sync_wall_objects(collection, walls, reusable):
+    """
+    对象模式增量同步：按墙体键比对上次生成的墙体对象
+    - 键仍存在的对象原样保留，只删除消失的墙体、只创建新增的墙体
+    - 行列数变化时（角点锚定晶格 + 与网格大小无关的雕刻权重）只有增减区域附近的墙体变化
+    返回 (created, kept, removed)
+    """
+    keys = get_wall_keys(walls)
+    key_set = set(keys)
+    removed = remove_objects(obj for key, obj in reusable.items() if key not in key_set)
+    kept_objects = [reusable[key] for key in key_set if key in reusable]
+    is_new = np.array([key not in reusable for key in keys], dtype=bool)
+
+    mesh = kept_objects[0].data if kept_objects else get_wall_mesh()
+    new_keys = [key for key, new in zip(keys, is_new.tolist()) if new]
+    created = build_wall_objects(collection, mesh, select_walls(walls, is_new), new_keys)
+    return created, len(kept_objects), removed
+
+def weld_vertices(verts, faces, tolerance=MAZE_WELD_TOLERANCE):
+    """按量化坐标合并重合顶点（np.unique 一次完成），返回 (verts, faces)"""
+    keys = np.round(verts / tolerance).astype(np.int64)
+    _keys, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    return verts[first], inverse.reshape(-1)[faces]
+
+def build_merged_wall_mesh(walls, name, weld=False):
+    """
+    将全部墙体写入单个网格（一个对象、一次绘制）
+    - 立方体顶点按墙体矩阵批量变换，顶点/面索引数组通过 foreach_set 一次写入
+    - 面属性 maze_row / maze_col / maze_edge（及合并段末端的 *_end）记录每个面所属墙体，合并后仍可按墙体选择
+    """
+    matrices = compute_wall_matrices(walls)
+    wall_count = len(matrices)
+    corners = np.column_stack((WALL_BOX_CORNERS, np.ones(len(WALL_BOX_CORNERS))))
+    verts = np.einsum("wij,cj->wci", matrices[:, :3, :], corners).reshape(-1, 3)
+    faces = (WALL_BOX_FACES[None, :, :] + (np.arange(wall_count) * len(WALL_BOX_CORNERS))[:, None, None]).reshape(-1, 4)
+    if weld:
+        verts, faces = weld_vertices(verts, faces)
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(verts))
+    mesh.vertices.foreach_set("co", verts.astype(np.float32).ravel())
+    mesh.loops.add(faces.size)
+    mesh.loops.foreach_set("vertex_index", faces.astype(np.int32).ravel())
+    mesh.polygons.add(len(faces))
+    mesh.polygons.foreach_set("loop_start", np.arange(0, faces.size, 4, dtype=np.int32))
+
+    faces_per_wall = len(WALL_BOX_FACES)
+    for attribute_name, values in get_wall_attributes(walls):
+        attribute = mesh.attributes.new(attribute_name, 'INT', 'FACE')
+        attribute.data.foreach_set("value", np.repeat(values, faces_per_wall).astype(np.int32))
+
+    mesh.update(calc_edges=True)
+    return mesh
+
+def assign_wall_chunks(walls, chunk_size):
+    """按墙体所属单元格的行列号划分 N×N 单元格分块，写入墙体表的 chunk 列"""
+    # 行列号为 int32，按 int64 计算分块键避免溢出
+    walls["chunk"] = (walls["row"].astype(np.int64) // chunk_size) * MAZE_CHUNK_STRIDE + walls["col"] // chunk_size
+    return walls
+
+def get_chunk_collection(collection):
+    """获取/创建迷宫集合下的分块子集合"""
+    for child in collection.children:
+        if child.get("maze_chunks"):
+            return child
+    chunk_collection = bpy.data.collections.new(MAZE_CHUNK_COLLECTION_NAME)
+    chunk_collection["maze_chunks"] = True
+    collection.children.link(chunk_collection)
+    return chunk_collection
+
+def hash_wall_table(walls, weld):
+    """墙体表内容摘要（坐标量化后哈希），用于判断分块是否需要重建"""
+    digest = hashlib.blake2b(digest_size=16)
+    for key in ("center", "rotation", "scale"):
+        digest.update(np.rint(walls[key] / MAZE_WELD_TOLERANCE).astype(np.int64).tobytes())
+    for _name, values in get_wall_attributes(walls):
+        digest.update(values.astype(np.int64).tobytes())
+    digest.update(b"weld" if weld else b"")
+    return digest.hexdigest()
+
+def sync_maze_chunks(collection, walls, weld):
+    """
+    分块输出：每个分块一个合并网格对象，放在分块子集合中
+    - 分块内容摘要未变化的对象直接保留，只重建变化的分块，删除已不存在的分块
+    - 雕刻在整个迷宫上完成后再分块，块边界墙体归属编号较小的单元格，分块无缝拼接
+    返回 (rebuilt, kept, removed)
+    """
+    chunk_collection = get_chunk_collection(collection)
+    existing = {tuple(obj["maze_chunk"]): obj for obj in chunk_collection.objects if "maze_chunk" in obj}
+
+    order = np.argsort(walls["chunk"], kind="stable")
+    chunk_ids, starts = np.unique(walls["chunk"][order], return_index=True)
+    ends = np.append(starts[1:], len(order))
+
+    rebuilt = kept = 0
+    for chunk_id, start, end in zip(chunk_ids.tolist(), starts.tolist(), ends.tolist()):
+        chunk_walls = select_walls(walls, order[start:end])
+        digest = hash_wall_table(chunk_walls, weld)
+        chunk_key = divmod(chunk_id, MAZE_CHUNK_STRIDE)
+        obj = existing.pop(chunk_key, None)
+        if obj is not None and obj.get("maze_chunk_hash") == digest:
+            kept += 1
+            continue
+
+        chunk_row, chunk_col = chunk_key
+        name = f"{MAZE_CHUNK_PREFIX}{chunk_row}_{chunk_col}"
+        mesh = build_merged_wall_mesh(chunk_walls, name, weld=weld)
+        if obj is None:
+            obj = bpy.data.objects.new(name, mesh)
+            obj["maze_chunk"] = chunk_key
+            chunk_collection.objects.link(obj)
+        else:
+            old_mesh = obj.data
+            obj.data = mesh
+            if old_mesh.users == 0:
+                bpy.data.meshes.remove(old_mesh)
+        obj["maze_chunk_hash"] = digest
+        rebuilt += 1
+
+    removed = remove_objects(existing.values())
+    return rebuilt, kept, removed
+
+# ==================== 3. 优化核心：共享网格直接创建墙体对象（无逐墙算子调用）====================
 class MESH_OT_generate_maze_grid(bpy.types.Operator):
     bl_idname = "mesh.generate_maze_grid"
     bl_label = _("Generate Polygon Maze")  # 英文基准标题（支持翻译）
@@ -90,17 +773,19 @@ class MESH_OT_generate_maze_grid(bpy.types.Operator):
         _cols = scene.col_count
         _edges = scene.edge_count
 
-        # 清空旧墙体（包括原型和关联体）
+        # 清空旧墙体：只处理迷宫生成集合，批量删除
         try:
             bpy.ops.object.mode_set(mode='OBJECT')
         except RuntimeError:
             pass
-        for obj in bpy.data.objects:
-            if obj.type == 'MESH' and obj.name.startswith(('Cell_', 'Wall_Prototype')):
-                obj.select_set(True)
-            else:
-                obj.select_set(False)
-        bpy.ops.object.delete()
+        maze_collection, new_collection = get_generated_collection(scene, "MAZE")
+        layout_key = get_maze_layout_key(scene)
+        reusable = prepare_maze_collection(maze_collection, scene.maze_output_mode, layout_key)
+        maze_collection["maze_layout_key"] = layout_key
+        maze_collection["maze_layout"] = {
+            "rows": _rows, "cols": _cols, "edges": _edges, "cell_length": _cell_len,
+            "wall_thickness": _wall_thk, "wall_height": _wall_h,
+        }
 
         # 打印生成信息（英文基准，支持翻译）
         print(_("=== Start Generating Maze (Linked Copy Optimization) ==="))
@@ -108,57 +793,134 @@ class MESH_OT_generate_maze_grid(bpy.types.Operator):
             rows=_rows, cols=_cols, edges=_edges, cell_len=_cell_len, wall_thk=_wall_thk, wall_h=_wall_h
         ))
 
-        # -------------------------- 关键优化：创建1个墙体原型 --------------------------
-        # 原型位置暂时设为(0,0,0)，后续关联复制后再调整
-        bpy.ops.mesh.primitive_cube_add(location=(0, 0, 0))
-        wall_prototype = context.active_object
-        wall_prototype.name = "Wall_Prototype"  # 原型命名（无需翻译，内部标识）
-        # 原型默认缩放（后续关联体可单独修改缩放，不影响原型）
-        wall_prototype.scale = (1, 1, 1)
-
-        # -------------------------- 关联复制批量生成墙体 --------------------------
-        total_walls = 0  # 统计总墙数
-        for row in range(_rows):
-            for col in range(_cols):
-                # 计算单元格中心点
-                cell_center = calculate_cell_center(
-                    row=row, col=col, rows=_rows, cols=_cols,
-                    cell_len=_cell_len, wall_height=_wall_h
-                )
-
-                # 为每条边生成关联墙体
-                for edge_idx in range(_edges):
-                    edge_center, edge_rot, edge_scale = calculate_edge_params(
-                        cell_center=cell_center, edge_index=edge_idx,
-                        edges=_edges, cell_len=_cell_len,
-                        wall_thk=_wall_thk, wall_h=_wall_h
-                    )
-
-                    # 关联复制（Shift+D，仅复制物体数据引用，不复制网格数据）
-                    bpy.ops.object.duplicate_move_linked(
-                        OBJECT_OT_duplicate={"linked": True},  # 关键：linked=True 关联复制
-                        TRANSFORM_OT_translate={"value": (0, 0, 0)}  # 先不移动，后续统一设置位置
-                    )
-
-                    # 获取关联体，设置位置、旋转、缩放
-                    linked_wall = context.active_object
-                    linked_wall.location = edge_center  # 位置
-                    linked_wall.rotation_euler = (0.0, 0.0, edge_rot)  # 旋转（绕Z轴）
-                    linked_wall.scale = edge_scale  # 缩放（每条边可能不同，单独设置）
-                    linked_wall.name = f"Cell_R{row}_C{col}_Edge{edge_idx}_Wall"  # 关联体命名（内部标识）
-
-                    total_walls += 1
-
-        # -------------------------- 隐藏原型（可选，不影响使用） --------------------------
-        wall_prototype.hide_viewport = True  # 视图中隐藏原型
-        wall_prototype.hide_render = True    # 渲染时隐藏原型
+        # -------------------------- 向量化计算全部墙体变换 --------------------------
+        start = time.perf_counter()
+        if _edges not in TILING_EDGE_COUNTS:
+            self.report({'WARNING'}, _("{edges}-sided cells cannot tile the plane, cells are placed on a square grid without shared borders").format(edges=_edges))
+        if scene.maze_share_walls:
+            # 拓扑只用行列号整数运算得到：每条边界一面墙，不生成重复墙体的几何
+            wall_cell, wall_edge, wall_neighbor = get_lattice_walls(_rows, _cols, _edges)
+            dropped = _rows * _cols * _edges - len(wall_cell)
+            self.report({'INFO'}, _("Dropped {count} duplicate shared walls").format(count=dropped))
+
+            # -------------------------- 雕刻通道：只有保留的墙体进入生成 --------------------------
+            if scene.maze_carve:
+                alive = carve_maze(wall_cell, wall_edge, wall_neighbor, _cols, _rows * _cols, scene.maze_seed)
+                maze_collection["maze_wall_count"] = len(alive)
+                maze_collection["maze_wall_bits"] = pack_wall_bits(alive)
+                self.report({'INFO'}, _("Carved {count} passages").format(count=int((~alive).sum())))
+                wall_cell, wall_edge = wall_cell[alive], wall_edge[alive]
+
+            # 只为保留的墙体计算几何
+            walls = calculate_maze_walls(
+                _rows, _cols, _edges, _cell_len, _wall_thk, _wall_h, shared=True, wall_cell=wall_cell, wall_edge=wall_edge
+            )
+        else:
+            walls = calculate_maze_walls(_rows, _cols, _edges, _cell_len, _wall_thk, _wall_h)
+
+        if scene.maze_output_mode == "CHUNKS":
+            assign_wall_chunks(walls, scene.maze_chunk_size)
+
+        # -------------------------- 共线墙体合并：直线通道合成一面长墙 --------------------------
+        if scene.maze_merge_collinear:
+            before = len(walls["row"])
+            walls, merged_count = merge_collinear_walls(walls)
+            self.report({'INFO'}, _("Merged {before} walls into {after} straight runs").format(
+                before=before, after=before - merged_count
+            ))
+
+        # -------------------------- 合并模式：全部墙体写入单个网格 --------------------------
+        if scene.maze_output_mode == "MERGED":
+            merged_mesh = build_merged_wall_mesh(walls, MAZE_MERGED_NAME, weld=scene.maze_weld_vertices)
+            merged_obj = bpy.data.objects.new(MAZE_MERGED_NAME, merged_mesh)
+            maze_collection.objects.link(merged_obj)
+            total_walls = len(walls["row"])
+            self.report({'INFO'}, _("Merged maze mesh: {vertices} vertices, {faces} faces").format(
+                vertices=len(merged_mesh.vertices), faces=len(merged_mesh.polygons)
+            ))
+
+        # -------------------------- 分块模式：每个分块一个合并网格，只重建变化的分块 --------------------------
+        elif scene.maze_output_mode == "CHUNKS":
+            rebuilt, kept, removed = sync_maze_chunks(maze_collection, walls, weld=scene.maze_weld_vertices)
+            total_walls = len(walls["row"])
+            self.report({'INFO'}, _("Chunks: {rebuilt} rebuilt, {kept} unchanged, {removed} removed").format(
+                rebuilt=rebuilt, kept=kept, removed=removed
+            ))
+
+        # -------------------------- 对象模式：共享原型网格批量创建墙体对象，按墙体键增量同步 --------------------------
+        else:
+            created, kept, removed = sync_wall_objects(maze_collection, walls, reusable)
+            total_walls = created + kept
+            if kept:
+                self.report({'INFO'}, _("Walls: {created} created, {kept} unchanged, {removed} removed").format(
+                    created=created, kept=kept, removed=removed
+                ))
+
+        # 全部墙体就绪后一次性挂到场景，避免逐对象视图层同步
+        if new_collection:
+            link_generated_collection(scene, maze_collection)
 
         # 生成完成提示（英文基准，支持翻译）
         total_cells = _rows * _cols
-        self.report({'INFO'}, _("Maze generation completed! {total_cells} cells, {total_walls} walls (linked copy optimization)"))
+        self.report({'INFO'}, _("Maze generation completed! {total_cells} cells, {total_walls} walls (linked copy optimization)").format(
+            total_cells=total_cells, total_walls=total_walls
+        ))
         print(_("=== Maze Generation Completed ==="))
         print(_("Optimization effect: Only 1 mesh data created, reducing {redundant} duplicate mesh occupancy").format(
-            redundant=total_walls-1
+            redundant=max(total_walls - 1, 0)
         ))
+        print(_("Maze walls built in {seconds:.2f}s").format(seconds=time.perf_counter() - start))
+
+        return {'FINISHED'}
+
+# ==================== 4. 迷宫求解：读取墙体位图，NumPy BFS 求出入口间路径 ====================
+class MESH_OT_solve_maze(bpy.types.Operator):
+    bl_idname = "mesh.solve_maze"
+    bl_label = _("Solve Maze")
+    bl_description = _("Find the path from the first to the last cell of the carved maze and add it as a curve or mesh strip")
+    bl_options = {'REGISTER', 'UNDO'}
 
-        return {'FINISHED'}
\ No newline at end of file
+    def execute(self, context):
+        scene = context.scene
+        maze_collection = find_generated_collection(scene, "MAZE")
+        if maze_collection is None or "maze_wall_bits" not in maze_collection or "maze_layout" not in maze_collection:
+            self.report({'WARNING'}, _("Generate a carved maze first!"))
+            return {'CANCELLED'}
+
+        # -------------------------- 由晶格行列数直接得到拓扑（无墙体几何），位图还原墙体存活状态 --------------------------
+        start = time.perf_counter()
+        layout = maze_collection["maze_layout"]
+        rows, cols, edges = layout["rows"], layout["cols"], layout["edges"]
+        cell_count = rows * cols
+        wall_cell, wall_edge, wall_neighbor = get_lattice_walls(rows, cols, edges)
+        if len(wall_cell) != maze_collection["maze_wall_count"]:
+            self.report({'ERROR'}, _("Stored maze walls do not match the maze layout, regenerate the maze"))
+            return {'CANCELLED'}
+        alive = unpack_wall_bits(maze_collection["maze_wall_bits"], len(wall_cell))
+
+        # -------------------------- 邻接表 + 层同步 BFS --------------------------
+        table, degree = build_passage_table(wall_cell, wall_edge, wall_neighbor, alive, cell_count, edges)
+        path = solve_maze_path(table, 0, cell_count - 1)
+        dead_ends = int((degree == 1).sum())
+        solve_seconds = time.perf_counter() - start
+        if len(path) == 0:
+            self.report({'WARNING'}, _("No path between the first and last cell"))
+            return {'CANCELLED'}
+
+        # -------------------------- 替换旧解路径 --------------------------
+        remove_objects(obj for obj in maze_collection.objects if obj.get("maze_solution"))
+        width = scene.maze_path_width
+        points, _orientation = get_cell_centers(path // cols, path % cols, layout["cell_length"], 0.0, edges)
+        points[:, 2] = width / 2 if scene.maze_path_type == "CURVE" else MAZE_PATH_LIFT
+        if len(points) == 1:
+            self.report({'INFO'}, _("Path length: {steps} steps, {dead_ends} dead ends").format(steps=0, dead_ends=dead_ends))
+            return {'FINISHED'}
+        path_obj = build_path_object(points, MAZE_SOLUTION_NAME, scene.maze_path_type, width)
+        path_obj["maze_solution"] = True
+        maze_collection.objects.link(path_obj)
+
+        length = float(np.linalg.norm(np.diff(points, axis=0), axis=1).sum())
+        self.report({'INFO'}, _("Path length: {steps} steps ({length:.2f}m), {dead_ends} dead ends, solved in {ms:.0f}ms").format(
+            steps=len(path) - 1, length=length, dead_ends=dead_ends, ms=solve_seconds * 1000
+        ))
+        return {'FINISHED'}
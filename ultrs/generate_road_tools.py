@@ -1,6 +1,5 @@
 import bpy
-import bmesh
-import mathutils
+import numpy as np
 
 # ==================== 1. 注册场景属性（仅保留道路模板名称）====================
 bpy.types.Scene.i_road_object_name = bpy.props.StringProperty(
@@ -25,50 +24,88 @@ bpy.types.Scene.t_road_object_name = bpy.props.StringProperty(
 )
 
 # ==================== 2. 通用工具函数（仅保留边数判断，移除所有角度计算）====================
-def collect_vertex_info(context):
-    """收集顶点信息（仅根据边数判断路口类型）"""
-    object_arrays = []
-    
+# 边数→路口类型映射（核心简化逻辑）
+EDGE_COUNT_TO_JUNCTION = {
+    1: "LINE",    # 1条边 → 直路
+    2: "L",       # 2条边 → L型
+    3: "T",       # 3条边 → T型
+    4: "CROSS"    # 4条边 → 十字型
+}
+
+def collect_road_graph(context):
+    """
+    向量化提取道路图（仅根据边数判断路口类型）
+    - 顶点坐标与边顶点对用 foreach_get 一次读出，np.bincount 统计每个顶点的边数
+    - 世界坐标由一次矩阵乘法得到，不构建BMesh、不逐顶点循环
+    返回 (graph, error)，graph 为数组字典：
+    - center_co (V, 3)：顶点世界坐标（保留2位小数）
+    - edge_count (V,)：顶点关联的边数
+    """
     # 获取选中的网格对象
     selected_objs = context.selected_objects
     if not selected_objs or selected_objs[0].type != 'MESH':
         return None, "请选中网格对象！"
     mesh_obj = selected_objs[0]
-    
-    # 转换为bmesh
-    bm = bmesh.new()
-    bm.from_mesh(mesh_obj.data)
-    bm.verts.ensure_lookup_table()
-    bm.edges.ensure_lookup_table()
-    
-    # 边数→路口类型映射（核心简化逻辑）
-    edge_count_to_junction = {
-        1: "LINE",    # 1条边 → 直路
-        2: "L",       # 2条边 → L型
-        3: "T",       # 3条边 → T型
-        4: "CROSS"    # 4条边 → 十字型
+    mesh = mesh_obj.data
+
+    vertex_count = len(mesh.vertices)
+    # 缓冲区类型与Blender内部存储一致（float32 / int32），foreach_get 直接整块拷贝
+    co = np.empty(vertex_count * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    edge_verts = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+    mesh.edges.foreach_get("vertices", edge_verts)
+
+    # 齐次坐标一次乘世界矩阵
+    matrix = np.array(mesh_obj.matrix_world)
+    homogeneous = np.column_stack((co.reshape(-1, 3).astype(np.float64), np.ones(vertex_count)))
+    center_co = np.round((homogeneous @ matrix.T)[:, :3], 2)
+
+    return {
+        "center_co": center_co,
+        "edge_count": np.bincount(edge_verts, minlength=vertex_count),
+    }, None
+
+def build_road_instances(context, graph, template_map, independent):
+    """
+    按路口类型批量复制模板对象并放到顶点位置（无旋转）
+    - 每种路口类型一次筛选出全部顶点，模板缺失时整类跳过
+    - independent=True 时同时拷贝Mesh数据（独立复制），否则共享数据块（关联复制）
+    返回 (created_count, missing_templates)
+    """
+    link = context.collection.objects.link
+    suffix = "independent" if independent else "linked"
+    created_count = 0
+    missing_templates = []
+    for edge_count, junction_type in EDGE_COUNT_TO_JUNCTION.items():
+        vertex_indices = np.flatnonzero(graph["edge_count"] == edge_count)
+        if len(vertex_indices) == 0:
+            continue
+
+        template_name = template_map.get(junction_type)
+        if not template_name or template_name not in bpy.data.objects:
+            missing_templates.append(template_name)
+            continue
+        template_obj = bpy.data.objects[template_name]
+
+        for vertex_index, location in zip(vertex_indices.tolist(), graph["center_co"][vertex_indices].tolist()):
+            new_instance = template_obj.copy()
+            if independent:
+                new_instance.data = template_obj.data.copy()
+            new_instance.name = f"{template_name}_{suffix}_V{vertex_index}"
+            new_instance.location = location
+            link(new_instance)
+        created_count += len(vertex_indices)
+
+    return created_count, missing_templates
+
+def get_template_map(scene):
+    """模板名称映射（从场景属性读取）"""
+    return {
+        "LINE": scene.i_road_object_name,
+        "L": scene.l_road_object_name,
+        "T": scene.t_road_object_name,
+        "CROSS": scene.x_road_object_name
     }
-    
-    # 遍历所有顶点
-    for vert in bm.verts:
-        # 获取中心点世界坐标
-        center_co = mesh_obj.matrix_world @ vert.co
-        # 获取关联的边数（核心判断依据）
-        edge_count = len(vert.link_edges)
-        
-        # 仅根据边数确定路口类型
-        junction_type = edge_count_to_junction.get(edge_count, "UNKNOWN")
-        
-        # 存储顶点信息（仅保留必要字段）
-        object_arrays.append({
-            "center_co": (round(center_co.x, 2), round(center_co.y, 2), round(center_co.z, 2)),
-            "vertex_index": f"V{vert.index}",
-            "edge_count": edge_count,
-            "junction_type": junction_type
-        })
-    
-    bm.free()
-    return object_arrays, None
 
 # ==================== 3. 核心算子1：实例关联生成道路 =====================
 class MESH_OT_generate_road_linked(bpy.types.Operator):
@@ -78,49 +115,24 @@ class MESH_OT_generate_road_linked(bpy.types.Operator):
     bl_options = {'REGISTER', 'UNDO'}
     
     def execute(self, context):
-        # 1. 收集顶点信息
-        object_arrays, error = collect_vertex_info(context)
+        # 1. 提取道路图（顶点世界坐标 + 边数）
+        graph, error = collect_road_graph(context)
         if error:
             self.report({'ERROR'}, error)
             return {'CANCELLED'}
         
-        if not object_arrays:
+        if len(graph["edge_count"]) == 0:
             self.report({'WARNING'}, "未收集到有效顶点信息！")
             return {'CANCELLED'}
         
-        # 2. 模板名称映射（从场景属性读取）
-        template_map = {
-            "LINE": context.scene.i_road_object_name,
-            "L": context.scene.l_road_object_name,
-            "T": context.scene.t_road_object_name,
-            "CROSS": context.scene.x_road_object_name
-        }
-        
-        # 3. 创建关联实例（不拷贝数据块）
-        created_count = 0
-        for vertex_info in object_arrays:
-            if vertex_info["junction_type"] == "UNKNOWN":
-                continue
-            
-            template_name = template_map.get(vertex_info["junction_type"])
-            if not template_name or template_name not in bpy.data.objects:
-                self.report({'WARNING'}, f"模板对象「{template_name}」不存在！")
-                continue
-            
-            template_obj = bpy.data.objects[template_name]
-            
-            # 关联复制：仅复制对象，共享Mesh数据
-            new_instance = template_obj.copy()
-            new_instance.name = f"{template_name}_linked_{vertex_info['vertex_index']}"
-            
-            # 设置位置（无旋转）
-            new_instance.location = vertex_info["center_co"]
-            
-            # 链接到场景
-            context.collection.objects.link(new_instance)
-            created_count += 1
+        # 2. 创建关联实例（不拷贝数据块）
+        created_count, missing_templates = build_road_instances(
+            context, graph, get_template_map(context.scene), independent=False
+        )
+        for template_name in missing_templates:
+            self.report({'WARNING'}, f"模板对象「{template_name}」不存在！")
         
-        # 4. 反馈结果
+        # 3. 反馈结果
         if created_count > 0:
             self.report({'INFO'}, f"成功创建 {created_count} 个关联道路实例！")
         else:
@@ -136,50 +148,24 @@ class MESH_OT_generate_road_independent(bpy.types.Operator):
     bl_options = {'REGISTER', 'UNDO'}
     
     def execute(self, context):
-        # 1. 收集顶点信息
-        object_arrays, error = collect_vertex_info(context)
+        # 1. 提取道路图（顶点世界坐标 + 边数）
+        graph, error = collect_road_graph(context)
         if error:
             self.report({'ERROR'}, error)
             return {'CANCELLED'}
         
-        if not object_arrays:
+        if len(graph["edge_count"]) == 0:
             self.report({'WARNING'}, "未收集到有效顶点信息！")
             return {'CANCELLED'}
         
-        # 2. 模板名称映射（从场景属性读取）
-        template_map = {
-            "LINE": context.scene.i_road_object_name,
-            "L": context.scene.l_road_object_name,
-            "T": context.scene.t_road_object_name,
-            "CROSS": context.scene.x_road_object_name
-        }
-        
-        # 3. 创建独立实例（拷贝数据块）
-        created_count = 0
-        for vertex_info in object_arrays:
-            if vertex_info["junction_type"] == "UNKNOWN":
-                continue
-            
-            template_name = template_map.get(vertex_info["junction_type"])
-            if not template_name or template_name not in bpy.data.objects:
-                self.report({'WARNING'}, f"模板对象「{template_name}」不存在！")
-                continue
-            
-            template_obj = bpy.data.objects[template_name]
-            
-            # 独立复制：复制对象+拷贝Mesh数据
-            new_instance = template_obj.copy()
-            new_instance.data = template_obj.data.copy()
-            new_instance.name = f"{template_name}_independent_{vertex_info['vertex_index']}"
-            
-            # 设置位置（无旋转）
-            new_instance.location = vertex_info["center_co"]
-            
-            # 链接到场景
-            context.collection.objects.link(new_instance)
-            created_count += 1
+        # 2. 创建独立实例（拷贝数据块）
+        created_count, missing_templates = build_road_instances(
+            context, graph, get_template_map(context.scene), independent=True
+        )
+        for template_name in missing_templates:
+            self.report({'WARNING'}, f"模板对象「{template_name}」不存在！")
         
-        # 4. 反馈结果
+        # 3. 反馈结果
         if created_count > 0:
             self.report({'INFO'}, f"成功创建 {created_count} 个独立道路实例！")
         else:
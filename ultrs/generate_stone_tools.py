@@ -1,9 +1,18 @@
 import bpy
 import bmesh
 import mathutils
-import random
 import math
+import time
+import numpy as np
+import base64
+from mathutils.bvhtree import BVHTree
 from bpy.app.translations import pgettext_iface as _
+from .generated_collection_tools import (
+    get_generated_collection,
+    link_generated_collection,
+    remove_objects,
+    select_generated_objects,
+)
 
 # ==================== 1. 注册场景属性 =====================
 bpy.types.Scene.stone_count = bpy.props.IntProperty(
@@ -11,7 +20,8 @@ bpy.types.Scene.stone_count = bpy.props.IntProperty(
     description=_("Number of stone instances to generate"),
     default=100,
     min=1,
-    max=5000
+    max=5000000,
+    soft_max=5000
 )
 
 # 分布模式：1-自动创建平面 2-选中对象（基于面散布）
@@ -20,18 +30,141 @@ bpy.types.Scene.stone_dist_mode = bpy.props.EnumProperty(
     description=_("Where to distribute stones"),
     items=[
         ("1", _("Auto Create Plane"), _("Create a new plane for stone distribution")),
-        ("2", _("Selected Object"), _("Distribute stones on selected object (based on faces)"))
+        ("2", _("Selected Object"), _("Distribute stones on selected object (based on faces)")),
+        ("3", _("Project onto Selected Surfaces"), _("Cast rays straight down onto all selected mesh objects (BVH) and place stones at the highest hit"))
     ],
     default="1"
 )
 
+# 投影模式参数：投射区域
+bpy.types.Scene.stone_project_region = bpy.props.EnumProperty(
+    name=_("Projection Region"),
+    description=_("XY region that rays are cast from"),
+    items=[
+        ("BOUNDS", _("Surface Bounds"), _("Combined XY bounds of all selected surfaces")),
+        ("CURSOR", _("Around 3D Cursor"), _("Square region centered on the 3D cursor"))
+    ],
+    default="BOUNDS"
+)
+bpy.types.Scene.stone_project_size = bpy.props.FloatProperty(
+    name=_("Region Size"),
+    description=_("Side length of the square projection region around the 3D cursor"),
+    default=20.0,
+    min=0.1
+)
+
+# 采样方式：随机（面积加权）/ 泊松盘（蓝噪声，最小间距）
+bpy.types.Scene.stone_sampling = bpy.props.EnumProperty(
+    name=_("Sampling Pattern"),
+    description=_("How stone positions are sampled on the faces"),
+    items=[
+        ("RANDOM", _("Random (Area Weighted)"), _("Independent random points, larger faces receive more stones")),
+        ("POISSON", _("Poisson Disk (Even Spacing)"), _("Blue-noise points keeping a minimum spacing derived from base size and maximum scale")),
+        ("NO_OVERLAP", _("Random (No Overlap)"), _("Random points, rejecting stones whose bounding radius (base size × scale) overlaps an already placed stone"))
+    ],
+    default="RANDOM"
+)
+
+# 间距过滤的重试预算（每个石块最多尝试的候选点数）
+bpy.types.Scene.stone_overlap_retries = bpy.props.IntProperty(
+    name=_("Retry Budget"),
+    description=_("Candidate positions tried per stone before giving up (Poisson / No Overlap)"),
+    default=30,
+    min=1,
+    max=1000
+)
+
+# 密度图：按权重源控制石块疏密（面采样模式）
+bpy.types.Scene.stone_density_source = bpy.props.EnumProperty(
+    name=_("Density Source"),
+    description=_("Weight source that makes stones cluster or thin out on the surface"),
+    items=[
+        ("NONE", _("Uniform"), _("Density depends on face area only")),
+        ("VERTEX_GROUP", _("Vertex Group"), _("Use the weights of a vertex group")),
+        ("COLOR_ATTRIBUTE", _("Color Attribute"), _("Use the brightness of a color attribute")),
+        ("IMAGE", _("Image Texture"), _("Use the brightness of an image sampled at the face UVs"))
+    ],
+    default="NONE"
+)
+bpy.types.Scene.stone_density_vertex_group = bpy.props.StringProperty(
+    name=_("Vertex Group"),
+    description=_("Vertex group whose weights control stone density"),
+    default=""
+)
+bpy.types.Scene.stone_density_color_attribute = bpy.props.StringProperty(
+    name=_("Color Attribute"),
+    description=_("Color attribute whose brightness controls stone density"),
+    default=""
+)
+bpy.types.Scene.stone_density_image = bpy.props.PointerProperty(
+    name=_("Density Image"),
+    description=_("Image whose brightness (sampled with the active UV map) controls stone density"),
+    type=bpy.types.Image
+)
+bpy.types.Scene.stone_density_invert = bpy.props.BoolProperty(
+    name=_("Invert Density"),
+    description=_("Place more stones where the weight is low"),
+    default=False
+)
+
+# 表面过滤：坡度/高度/朝向（采样前按面一次性计算掩码）
+bpy.types.Scene.stone_slope_min = bpy.props.FloatProperty(
+    name=_("Minimum Slope"),
+    description=_("Faces flatter than this angle (from world up) receive no stones"),
+    subtype='ANGLE',
+    default=0.0,
+    min=0.0,
+    max=math.pi
+)
+bpy.types.Scene.stone_slope_max = bpy.props.FloatProperty(
+    name=_("Maximum Slope"),
+    description=_("Faces steeper than this angle (from world up) receive no stones, above 90° are overhangs"),
+    subtype='ANGLE',
+    default=math.pi,
+    min=0.0,
+    max=math.pi
+)
+bpy.types.Scene.stone_use_altitude = bpy.props.BoolProperty(
+    name=_("Limit Altitude"),
+    description=_("Only place stones on faces whose world Z lies within the altitude range"),
+    default=False
+)
+bpy.types.Scene.stone_altitude_min = bpy.props.FloatProperty(
+    name=_("Minimum Altitude"),
+    description=_("Lowest world Z that receives stones"),
+    subtype='DISTANCE',
+    default=-10.0
+)
+bpy.types.Scene.stone_altitude_max = bpy.props.FloatProperty(
+    name=_("Maximum Altitude"),
+    description=_("Highest world Z that receives stones"),
+    subtype='DISTANCE',
+    default=10.0
+)
+bpy.types.Scene.stone_facing_direction = bpy.props.FloatVectorProperty(
+    name=_("Facing Direction"),
+    description=_("World direction the face normals are compared with"),
+    subtype='DIRECTION',
+    size=3,
+    default=(0.0, 0.0, 1.0)
+)
+bpy.types.Scene.stone_facing_angle = bpy.props.FloatProperty(
+    name=_("Facing Angle"),
+    description=_("Maximum angle between face normal and facing direction (180° disables the filter)"),
+    subtype='ANGLE',
+    default=math.pi,
+    min=0.0,
+    max=math.pi
+)
+
 # 复制模式（关联/独立）
 bpy.types.Scene.stone_copy_mode = bpy.props.EnumProperty(
     name=_("Copy Mode"),
     description=_("How to copy stone mesh data"),
     items=[
         ("LINKED", _("Linked Copy (Shared Mesh)"), _("Shared mesh data, low performance cost")),
-        ("INDEPENDENT", _("Independent Copy (Unique Mesh)"), _("Independent mesh data, high performance cost"))
+        ("INDEPENDENT", _("Independent Copy (Unique Mesh)"), _("Independent mesh data, high performance cost")),
+        ("INSTANCED", _("Geometry Nodes Instances"), _("One point cloud object instancing the stone via Geometry Nodes, supports millions of stones"))
     ],
     default="LINKED"
 )
@@ -52,6 +185,27 @@ bpy.types.Scene.stone_irregularity = bpy.props.FloatProperty(
     max=1.0
 )
 
+bpy.types.Scene.stone_subdivisions = bpy.props.IntProperty(
+    name=_("Subdivisions"),
+    description=_("Icosphere subdivisions of each stone shape (higher = more surface detail)"),
+    default=1,
+    min=1,
+    max=5
+)
+bpy.types.Scene.stone_seed = bpy.props.IntProperty(
+    name=_("Seed"),
+    description=_("Random seed for stone shapes and placement (same seed reproduces the same result)"),
+    default=0,
+    min=0
+)
+bpy.types.Scene.stone_variant_count = bpy.props.IntProperty(
+    name=_("Shape Variants"),
+    description=_("Number of distinct stone shapes built once and shared by all stones"),
+    default=8,
+    min=1,
+    max=64
+)
+
 # 分布参数（基于面）
 bpy.types.Scene.stone_scale_min = bpy.props.FloatProperty(
     name=_("Minimum Scale"),
@@ -122,50 +276,186 @@ def get_principled_bsdf_node(mat):
     
     return bsdf_node
 
+# 逐对象复制模式下的数量上限（更大数量请使用几何节点实例模式）
+MAX_OBJECT_STONES = 50000
+
+# 逐对象复制模式的对象命名前缀（内部标识）
+STONE_NAME_PREFIX = "Face_Stone_"
+# 分帧生成：每个计时器事件的时间预算（秒）与每批创建的对象数
+STONE_MODAL_TICK = 0.016
+STONE_MODAL_BATCH = 64
+# 分帧生成的阶段：采样 → 新建 → 重设已有石块 → 提交（删除多余石块与被替换的网格，不可取消）
+STONE_MODAL_STAGES = ("SAMPLE", "CREATE", "REPOSE", "REMOVE")
+# 间距过滤每检测多少个候选点、投影每投射多少条射线让出一次（分帧生成在两次让出之间检查时间预算）
+STONE_SAMPLE_CHUNK = 512
+
+# 由种子派生的独立随机序列编号（采样 / 泊松追加 / 石块随机量）
+STONE_STREAM_SAMPLING = 0
+STONE_STREAM_POISSON = 1
+STONE_STREAM_VARIATION = 2
+STONE_STREAM_SHAPE = 3
+STONE_STREAM_PROJECT = 4
+
+# 几何节点实例模式使用的数据块名称（内部标识）
+STONE_INSTANCER_NAME = "Stone_Instances"
+STONE_INSTANCER_GROUP = "Auto_Stone_Instancer"
+
+# 石块变体库（隐藏集合 + 按形状参数缓存的网格）
+STONE_LIBRARY_NAME = "Auto_Stone_Library"
+STONE_VARIANT_PREFIX = "Auto_Generated_Stone_V"
+STONE_MATERIAL_NAME = "Auto_Stone_Material"
+STONE_NOISE_OCTAVES = 4
+
 # ==================== 2. 核心工具函数（基于面的随机点）====================
-def create_auto_stone(scene):
-    """完全自动创建石块"""
-    if "Auto_Generated_Stone" in bpy.data.objects:
-        bpy.data.objects.remove(bpy.data.objects["Auto_Generated_Stone"])
-    
-    # 创建二十面体作为基础石块
-    bpy.ops.mesh.primitive_ico_sphere_add(
-        subdivisions=1,
-        radius=scene.stone_base_size,
-        location=(0, 0, 0)
-    )
-    auto_stone = bpy.context.active_object
-    auto_stone.name = "Auto_Generated_Stone"
-    
-    # 应用变换
-    bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)
-    
-    # 顶点扰动创建不规则形状
-    mesh = auto_stone.data
-    for v in mesh.vertices:
-        perturb = random.uniform(1-scene.stone_irregularity, 1+scene.stone_irregularity)
-        v.co.x *= perturb
-        v.co.y *= perturb
-        v.co.z *= perturb
-    mesh.update()
-    
-    # 创建基础材质（修复核心：使用通用节点获取函数）
-    mat = bpy.data.materials.new(name="Auto_Stone_Material")
+def get_stone_material():
+    """
+    获取/创建所有石块共享的唯一材质
+    - 灰度由Attribute节点（实例者类型）读取stone_gray：
+      对象模式读取对象自定义属性，几何节点实例模式读取实例属性
+    - 不再为每个石块复制材质，只编译一次着色器
+    """
+    mat = bpy.data.materials.get(STONE_MATERIAL_NAME)
+    if mat is None:
+        mat = bpy.data.materials.new(name=STONE_MATERIAL_NAME)
     bsdf = get_principled_bsdf_node(mat)  # ✅ 替换原有的直接索引方式
-    bsdf.inputs['Base Color'].default_value = (0.7, 0.7, 0.7, 1.0)
-    bsdf.inputs['Roughness'].default_value = 0.9
-    
-    if auto_stone.data.materials:
-        auto_stone.data.materials[0] = mat
-    else:
-        auto_stone.data.materials.append(mat)
-    
-    return auto_stone
+    nodes = mat.node_tree.nodes
+    if nodes.get("Stone Gray") is None:
+        bsdf.inputs['Roughness'].default_value = 0.9
+        attr_node = nodes.new(type='ShaderNodeAttribute')
+        attr_node.name = "Stone Gray"
+        attr_node.attribute_type = 'INSTANCER'
+        attr_node.attribute_name = "stone_gray"
+        attr_node.location = (bsdf.location.x - 300, bsdf.location.y)
+        mat.node_tree.links.new(attr_node.outputs['Fac'], bsdf.inputs['Base Color'])
+    return mat
+
+def get_stone_variant_key(scene):
+    """形状参数缓存键：(seed, 基础尺寸, 不规则度, 细分)"""
+    return f"{scene.stone_seed}|{scene.stone_base_size:.6f}|{scene.stone_irregularity:.6f}|{scene.stone_subdivisions}"
+
+def _lattice_values(ix, iy, iz, seed):
+    """整数格点哈希 → [-1, 1] 伪随机值（uint32溢出即取模）"""
+    h = (ix.astype(np.uint32) * np.uint32(73856093)) \
+        ^ (iy.astype(np.uint32) * np.uint32(19349663)) \
+        ^ (iz.astype(np.uint32) * np.uint32(83492791)) \
+        ^ np.uint32(seed & 0xFFFFFFFF)
+    h ^= h >> np.uint32(13)
+    h *= np.uint32(0x5BD1E995)
+    h ^= h >> np.uint32(15)
+    return h.astype(np.float64) / 2147483647.5 - 1.0
+
+def value_noise_3d(points, seed):
+    """向量化3D值噪声：格点哈希 + smoothstep三线性插值，输出约 [-1, 1]"""
+    base = np.floor(points)
+    frac = points - base
+    fx, fy, fz = (frac * frac * (3.0 - 2.0 * frac)).T
+    ix, iy, iz = base.astype(np.int64).T
+
+    def corner(dx, dy, dz):
+        return _lattice_values(ix + dx, iy + dy, iz + dz, seed)
+
+    x00 = corner(0, 0, 0) + (corner(1, 0, 0) - corner(0, 0, 0)) * fx
+    x10 = corner(0, 1, 0) + (corner(1, 1, 0) - corner(0, 1, 0)) * fx
+    x01 = corner(0, 0, 1) + (corner(1, 0, 1) - corner(0, 0, 1)) * fx
+    x11 = corner(0, 1, 1) + (corner(1, 1, 1) - corner(0, 1, 1)) * fx
+    y0 = x00 + (x10 - x00) * fy
+    y1 = x01 + (x11 - x01) * fy
+    return y0 + (y1 - y0) * fz
+
+def fractal_noise_3d(points, seed, octaves=STONE_NOISE_OCTAVES, lacunarity=2.0, gain=0.5):
+    """多倍频（fBm）3D噪声，按振幅总和归一化到约 [-1, 1]"""
+    total = np.zeros(len(points))
+    amplitude = 1.0
+    frequency = 1.0
+    amplitude_sum = 0.0
+    for octave in range(octaves):
+        total += amplitude * value_noise_3d(points * frequency, seed + octave * 1013)
+        amplitude_sum += amplitude
+        amplitude *= gain
+        frequency *= lacunarity
+    return total / amplitude_sum
+
+def build_stone_variant_mesh(scene, variant_index, key, material):
+    """
+    构建单个扰动石块网格（bmesh直接构建，不经过bpy.ops）
+    - 顶点坐标通过foreach_get/foreach_set整体读写，扰动全部由NumPy完成
+    - 随机椭球比例决定整体轮廓，多倍频噪声沿法线位移产生表面细节
+    """
+    bm = bmesh.new()
+    bmesh.ops.create_icosphere(bm, subdivisions=scene.stone_subdivisions, radius=1.0)
+    mesh = bpy.data.meshes.new(f"Auto_Stone_Variant_{variant_index}")
+    bm.to_mesh(mesh)
+    bm.free()
+
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    # 单位球面上的顶点坐标即为法线方向
+    normals = co.reshape(-1, 3).astype(np.float64)
+    normals /= np.linalg.norm(normals, axis=1)[:, None]
+
+    # 每个变体独立的确定性随机序列
+    rng = np.random.default_rng([scene.stone_seed, STONE_STREAM_SHAPE, variant_index])
+    irregularity = scene.stone_irregularity
+    axis_scale = 1.0 + irregularity * rng.uniform(-0.5, 0.5, 3)
+    noise_offset = rng.uniform(-1000.0, 1000.0, 3)
+    noise_seed = int(rng.integers(0, 2 ** 31))
+
+    displacement = irregularity * 0.5 * fractal_noise_3d(normals * 1.5 + noise_offset, noise_seed)
+    co = normals * (1.0 + displacement)[:, None] * axis_scale * scene.stone_base_size
+    mesh.vertices.foreach_set("co", co.astype(np.float32).ravel())
+    mesh.update()
+
+    mesh.materials.append(material)
+    mesh["stone_variant_key"] = key
+    return mesh
+
+def get_stone_library(scene):
+    """
+    获取/创建石块变体库（按形状参数缓存）
+    - 每组 (seed, 基础尺寸, 不规则度, 细分) 只构建一次K个扰动网格
+    - 网格由隐藏集合中的变体对象持有，跨运行/重做复用
+    - 参数不变时直接返回已有变体，不重建任何网格
+    """
+    key = get_stone_variant_key(scene)
+    library = bpy.data.collections.get(STONE_LIBRARY_NAME)
+    if library is None:
+        library = bpy.data.collections.new(STONE_LIBRARY_NAME)
+        library.hide_viewport = True
+        library.hide_render = True
+    if scene.collection.children.get(library.name) is None:
+        scene.collection.children.link(library)
+
+    variants = []
+    for k in range(scene.stone_variant_count):
+        name = f"{STONE_VARIANT_PREFIX}{k}"
+        obj = bpy.data.objects.get(name)
+        if obj is None or obj.type != 'MESH' or obj.data.get("stone_variant_key") != key:
+            mesh = build_stone_variant_mesh(scene, k, key, get_stone_material())
+            if obj is None or obj.type != 'MESH':
+                obj = bpy.data.objects.new(name, mesh)
+                obj["stone_gray"] = 0.7
+            else:
+                # 旧网格若仍被之前生成的石块使用则保留
+                old_mesh = obj.data
+                obj.data = mesh
+                if old_mesh.users == 0:
+                    bpy.data.meshes.remove(old_mesh)
+        if library.objects.get(obj.name) is None:
+            library.objects.link(obj)
+        variants.append(obj)
+
+    # 移除超出变体数量的旧变体对象
+    for obj in list(library.objects):
+        if obj not in variants:
+            bpy.data.objects.remove(obj)
+
+    return variants
 
 def create_distribution_plane(scene):
-    """创建分布平面（细分增加面数，让分布更均匀）"""
-    if "Distribution_Plane" in bpy.data.objects:
-        bpy.data.objects.remove(bpy.data.objects["Distribution_Plane"])
+    """创建分布平面（细分增加面数，让分布更均匀；已存在时直接复用）"""
+    plane = bpy.data.objects.get("Distribution_Plane")
+    if plane and plane.type == 'MESH':
+        return plane
     
     # 创建平面并细分（增加面数）
     bpy.ops.mesh.primitive_plane_add(
@@ -194,117 +484,1200 @@ def create_distribution_plane(scene):
     return plane
 
 def get_object_faces_data(obj):
-    """获取对象所有面的详细数据（世界坐标）"""
+    """
+    获取对象三角化后的面数据（世界坐标，NumPy数组）
+    - 通过loop_triangles一次性三角化，foreach_get批量读取，避免逐面Python循环
+    - 返回三角形顶点、法线、面积及累积面积表；无有效面时返回None
+    """
     if not obj or obj.type != 'MESH':
-        return []
+        return None
+
+    mesh = obj.data
+    mesh.calc_loop_triangles()
+    tri_count = len(mesh.loop_triangles)
+    if tri_count == 0:
+        return None
+
+    # 顶点坐标批量读取，并一次矩阵乘法转换到世界坐标
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    matrix = np.array(obj.matrix_world, dtype=np.float64)
+    co = co.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+
+    # 三角形顶点索引 → 每个三角形的三个世界坐标顶点 (T, 3, 3)
+    tri_verts = np.empty(tri_count * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("vertices", tri_verts)
+    tri_co = co[tri_verts.reshape(-1, 3)]
+
+    # 世界坐标下计算法线和面积（兼容非等比缩放）
+    cross = np.cross(tri_co[:, 1] - tri_co[:, 0], tri_co[:, 2] - tri_co[:, 0])
+    double_area = np.linalg.norm(cross, axis=1)
+    normals = cross / np.maximum(double_area, 1e-12)[:, None]
+    areas = double_area * 0.5
+    cumulative_area = np.cumsum(areas)
+    if cumulative_area[-1] <= 0.0:
+        return None
+
+    # 原始面的中心和法线（过滤用），经polygon_index映射到每个三角形
+    poly_count = len(mesh.polygons)
+    poly_center = np.empty(poly_count * 3, dtype=np.float32)
+    mesh.polygons.foreach_get("center", poly_center)
+    tri_poly = np.empty(tri_count, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("polygon_index", tri_poly)
+    face_centers = (poly_center.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3])[tri_poly]
+    # 面法线取其三角形世界坐标叉积之和（面积加权），无需对变换矩阵求逆（零缩放轴时矩阵奇异）
+    poly_normal = np.column_stack([np.bincount(tri_poly, weights=cross[:, axis], minlength=poly_count) for axis in range(3)])
+    face_normals = poly_normal[tri_poly]
+    face_normals /= np.maximum(np.linalg.norm(face_normals, axis=1), 1e-12)[:, None]
+
+    alias_prob, alias_index = build_alias_table(areas)
+    return {
+        "tri_co": tri_co,
+        "normals": normals,
+        "areas": areas,
+        "cumulative_area": cumulative_area,
+        "face_centers": face_centers,
+        "face_normals": face_normals,
+        "alias_prob": alias_prob,
+        "alias_index": alias_index,
+        "density_key": "",
+    }
+
+def get_face_filter(scene):
+    """
+    读取坡度/高度/朝向过滤参数，全部未启用时返回None
+    - 坡度为法线与世界Z轴的夹角（0°水平，90°竖直，大于90°为倒悬面）
+    """
+    face_filter = {}
+    if scene.stone_slope_min > 0.0 or scene.stone_slope_max < math.pi:
+        face_filter["slope"] = (scene.stone_slope_min, scene.stone_slope_max)
+    if scene.stone_use_altitude:
+        face_filter["altitude"] = (scene.stone_altitude_min, scene.stone_altitude_max)
+    if scene.stone_facing_angle < math.pi:
+        direction = np.array(scene.stone_facing_direction, dtype=np.float64)
+        length = np.linalg.norm(direction)
+        if length > 0.0:
+            face_filter["facing"] = (tuple(direction / length), math.cos(scene.stone_facing_angle))
+    return face_filter or None
+
+def get_face_filter_key(face_filter):
+    """过滤参数的布局键片段"""
+    if face_filter is None:
+        return ""
+    return ";".join(f"{name}={np.round(np.hstack(value), 6).tolist()}" for name, value in sorted(face_filter.items()))
+
+def compute_face_filter_mask(face_filter, centers, normals):
+    """按过滤参数对中心点/法线数组一次性计算布尔掩码（向量化，与石块数量无关）"""
+    mask = np.ones(len(centers), dtype=bool)
+    if "slope" in face_filter:
+        slope_min, slope_max = face_filter["slope"]
+        slope = np.arccos(np.clip(normals[:, 2], -1.0, 1.0))
+        mask &= (slope >= slope_min) & (slope <= slope_max)
+    if "altitude" in face_filter:
+        altitude_min, altitude_max = face_filter["altitude"]
+        mask &= (centers[:, 2] >= altitude_min) & (centers[:, 2] <= altitude_max)
+    if "facing" in face_filter:
+        direction, cos_angle = face_filter["facing"]
+        mask &= normals @ np.array(direction) >= cos_angle
+    return mask
+
+def build_alias_table(weights):
+    """
+    Vose别名表（NumPy向量化构建，无逐项Python循环）
+    - 权重归一化为均值1：q<1为轻项，q>=1为重项
+    - 等价于顺序扫描构建：轻项按顺序由当前重项补足，重项剩余不足1时自身成桶，
+      差额由下一个重项补足；扫描位置由前缀和 + searchsorted 直接求出
+    - 抽样时任意分布都只需一次取桶、一次比较，N次抽样为 O(N)
+    返回 (prob, alias)
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    count = len(weights)
+    q = weights * (count / weights.sum())
+    prob = np.ones(count)
+    alias = np.arange(count)
+
+    light = np.flatnonzero(q < 1.0)
+    heavy = np.flatnonzero(q >= 1.0)
+    if len(light) == 0 or len(heavy) == 0:
+        return prob, alias
+
+    # 轻项差额的前缀和；重项j在轻项差额累计达到threshold[j]时耗尽
+    deficit = np.concatenate(([0.0], np.cumsum(1.0 - q[light])))
+    heavy_end = np.cumsum(q[heavy])
+    threshold = heavy_end - 1.0 - np.arange(len(heavy))
+
+    # 轻项：别名为处理到它时的当前重项
+    owner = np.searchsorted(threshold, deficit[:-1], side="right")
+    valid = owner < len(heavy)
+    prob[light[valid]] = q[light[valid]]
+    alias[light[valid]] = heavy[owner[valid]]
+
+    # 重项：剩余量成桶，别名为下一个重项（最后一个重项概率为1）
+    served = np.searchsorted(deficit[:-1], threshold, side="left")
+    position = deficit[served] + np.arange(len(heavy))
+    prob[heavy[:-1]] = np.clip(heavy_end[:-1] - position[:-1], 0.0, 1.0)
+    alias[heavy[:-1]] = heavy[1:]
+    return prob, alias
+
+def get_triangle_density(scene, obj):
+    """
+    读取密度权重源，转换为每个三角形的权重 (T,)
+    - 顶点组/点域颜色属性取三角形三个顶点的均值，角域颜色属性取三个角的均值
+    - 图像在活动UV下按三角形三个角与中心采样取均值（最近像素，UV平铺）
+    - 未设置权重源或找不到对应数据时返回None
+    """
+    source = scene.stone_density_source
+    if source == "NONE" or not obj or obj.type != 'MESH':
+        return None
+
+    mesh = obj.data
+    tri_count = len(mesh.loop_triangles)
+    tri_verts = np.empty(tri_count * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("vertices", tri_verts)
+    tri_verts = tri_verts.reshape(-1, 3)
+    tri_loops = np.empty(tri_count * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("loops", tri_loops)
+    tri_loops = tri_loops.reshape(-1, 3)
+
+    if source == "VERTEX_GROUP":
+        group = obj.vertex_groups.get(scene.stone_density_vertex_group)
+        if group is None:
+            return None
+        index = group.index
+        weights = np.array([
+            next((g.weight for g in vert.groups if g.group == index), 0.0)
+            for vert in mesh.vertices
+        ], dtype=np.float64)
+        density = weights[tri_verts].mean(axis=1)
+
+    elif source == "COLOR_ATTRIBUTE":
+        attribute = mesh.color_attributes.get(scene.stone_density_color_attribute)
+        if attribute is None or attribute.domain not in {'POINT', 'CORNER'}:
+            return None
+        colors = np.empty(len(attribute.data) * 4, dtype=np.float32)
+        attribute.data.foreach_get("color", colors)
+        colors = colors.reshape(-1, 4)
+        luminance = colors[:, :3] @ np.array((0.2126, 0.7152, 0.0722))
+        corners = tri_verts if attribute.domain == 'POINT' else tri_loops
+        density = luminance[corners].mean(axis=1)
+
+    else:
+        image = scene.stone_density_image
+        uv_layer = mesh.uv_layers.active
+        if image is None or uv_layer is None:
+            return None
+        width, height = image.size
+        if width == 0 or height == 0:
+            return None
+        pixels = np.empty(width * height * 4, dtype=np.float32)
+        image.pixels.foreach_get(pixels)
+        luminance = pixels.reshape(-1, 4)[:, :3] @ np.array((0.2126, 0.7152, 0.0722))
+
+        uv = np.empty(len(uv_layer.uv) * 2, dtype=np.float32)
+        uv_layer.uv.foreach_get("vector", uv)
+        tri_uv = uv.reshape(-1, 2)[tri_loops]
+        samples = np.concatenate((tri_uv, tri_uv.mean(axis=1, keepdims=True)), axis=1)
+        px = (np.mod(samples[..., 0], 1.0) * width).astype(np.int64).clip(0, width - 1)
+        py = (np.mod(samples[..., 1], 1.0) * height).astype(np.int64).clip(0, height - 1)
+        density = luminance[py * width + px].mean(axis=1)
+
+    density = np.clip(density, 0.0, None)
+    if scene.stone_density_invert:
+        density = np.clip(1.0 - density, 0.0, None)
+    return density
+
+def apply_triangle_density(face_data, density):
+    """
+    将三角形密度与面积合并，重建别名表
+    - 合并后权重全为0时保持按面积分布并返回False
+    """
+    weights = face_data["areas"] * density
+    total = weights.sum()
+    if total <= 0.0:
+        return False
+    face_data["alias_prob"], face_data["alias_index"] = build_alias_table(weights)
+    face_data["density_key"] = f"{total:.6f}:{float(weights @ np.arange(len(weights))):.6f}"
+    return True
+
+def sample_points_on_faces(face_data, count, rng, start=0):
+    """
+    按面积（及密度权重）加权在三角面上一次性采样随机点
+    - 别名表选面：第一列随机数的整数部分取桶、小数部分决定取本项或别名，
+      与分布偏斜程度无关，每个点 O(1)
+    - 均匀重心坐标采样，点始终落在三角形内部
+    - 随机数按行一次性生成，结果前缀稳定：同一随机序列下第i个点与count无关，
+      start>0 时只返回 [start, count) 部分（用于增量追加）
+    返回 (tri_index, bary)：三角形索引 (N,) 与重心坐标 (N, 3)
+    """
+    u = rng.random((count, 3))[start:]
+    alias_prob = face_data["alias_prob"]
+    scaled = u[:, 0] * len(alias_prob)
+    bucket = np.minimum(scaled.astype(np.int64), len(alias_prob) - 1)
+    tri_index = np.where(scaled - bucket < alias_prob[bucket], bucket, face_data["alias_index"][bucket])
+
+    # 均匀重心坐标：sqrt变换保证三角形内均匀分布
+    r1 = np.sqrt(u[:, 1])
+    r2 = u[:, 2]
+    bary = np.column_stack((1.0 - r1, r1 * (1.0 - r2), r1 * r2))
+    return tri_index, bary
+
+def evaluate_surface_points(face_data, tri_index, bary):
+    """由三角形索引和重心坐标计算世界坐标点与法线"""
+    points = np.einsum("ni,nij->nj", bary, face_data["tri_co"][tri_index])
+    normals = face_data["normals"][tri_index]
+    return points, normals
+
+class SpatialHash:
+    """
+    均匀网格空间哈希（邻域查询 O(1)）
+    - 单元尺寸不小于任意两点的最大间距要求，查询只需检查 3×3×3 个单元
+    - 每个点带半径，两点间距需不小于半径之和
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def _key(self, point):
+        size = self.cell_size
+        return (math.floor(point[0] / size), math.floor(point[1] / size), math.floor(point[2] / size))
+
+    def insert(self, point, radius):
+        self.cells.setdefault(self._key(point), []).append((point, radius))
+
+    def is_free(self, point, radius):
+        kx, ky, kz = self._key(point)
+        px, py, pz = point
+        cells = self.cells
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for dz in (-1, 0, 1):
+                    cell = cells.get((kx + dx, ky + dy, kz + dz))
+                    if not cell:
+                        continue
+                    for (qx, qy, qz), q_radius in cell:
+                        min_dist = radius + q_radius
+                        if (px - qx) ** 2 + (py - qy) ** 2 + (pz - qz) ** 2 < min_dist * min_dist:
+                            return False
+        return True
+
+def get_poisson_spacing(scene):
+    """泊松盘最小间距：两个最大缩放石块的基础半径之和"""
+    return 2.0 * scene.stone_base_size * scene.stone_scale_max
+
+def get_stone_radii(scene, count):
+    """
+    每个石块位置的排斥半径，随机采样时返回None
+    - 泊松盘：统一取最大缩放石块的半径
+    - 不重叠：基础尺寸 × 该位置石块的缩放（与 draw_stone_variation 同一随机流）
+    """
+    if scene.stone_sampling == "POISSON":
+        return np.full(count, get_poisson_spacing(scene) * 0.5)
+    if scene.stone_sampling == "NO_OVERLAP":
+        return scene.stone_base_size * draw_stone_variation(scene, count, 1)[1]
+    return None
+
+def create_radius_grid(radii, existing_points):
+    """按最大排斥半径建立空间哈希，并写入已放置的点（第i个点使用radii[i]）"""
+    grid = SpatialHash(max(2.0 * float(radii.max()), 1e-6))
+    for point, radius in zip(existing_points.tolist(), radii.tolist()):
+        grid.insert(point, radius)
+    return grid
+
+def iter_poisson_points_on_faces(face_data, count, radii, rng, existing=None, attempts_per_stone=30):
+    """
+    表面间距过滤采样（泊松盘 / 不重叠），生成器
+    - 候选点由面积加权采样分批向量化生成，始终位于网格表面
+    - 第i个石块使用排斥半径radii[i]，逐个候选点通过空间哈希做 O(1) 检测
+    - existing 为已放置的 (tri_index, bary)，先写入空间哈希，只追加新点
+    - 候选预算用尽时停止，返回的新点数可能少于所需
+    - 每检测 STONE_SAMPLE_CHUNK 个候选点让出一次已放置的总点数
+    结束时返回新增点的 (tri_index, bary, rejected)
+    """
+    placed = 0
+    existing_points = np.empty((0, 3))
+    if existing is not None and len(existing[0]):
+        existing_points, _normals = evaluate_surface_points(face_data, *existing)
+        placed = len(existing_points)
+    grid = create_radius_grid(radii, existing_points)
+
+    accepted_tri = []
+    accepted_bary = []
+    rejected = 0
+    needed = count - placed
+    budget = max(needed, 0) * attempts_per_stone
+
+    while len(accepted_tri) < needed and budget > 0:
+        batch = min(max(needed, 1024), budget)
+        budget -= batch
+        cand_tri, cand_bary = sample_points_on_faces(face_data, batch, rng)
+        cand_points, _normals = evaluate_surface_points(face_data, cand_tri, cand_bary)
+        for i, point in enumerate(cand_points.tolist()):
+            if i and i % STONE_SAMPLE_CHUNK == 0:
+                yield placed + len(accepted_tri)
+            radius = radii[placed + len(accepted_tri)]
+            if grid.is_free(point, radius):
+                grid.insert(point, radius)
+                accepted_tri.append(cand_tri[i])
+                accepted_bary.append(cand_bary[i])
+                if len(accepted_tri) >= needed:
+                    break
+            else:
+                rejected += 1
+
+    return np.array(accepted_tri, dtype=np.int64), np.array(accepted_bary, dtype=np.float64).reshape(-1, 3), rejected
+
+# BVH缓存：对象名称 → (求值后几何指纹, 对象空间BVHTree)，只保留当前投射表面
+_SURFACE_BVH_CACHE = {}
+
+def get_surface_bvh(obj, depsgraph):
+    """
+    获取对象空间的BVHTree（含修改器/形态键/骨骼变形的求值结果），按对象缓存
+    - Python接口没有网格更新计数，改用求值后网格的顶点/面数量与坐标校验和作为几何指纹，
+      几何未变化时直接复用，不重建BVH
+    返回 (tree, fingerprint)
+    """
+    mesh = obj.evaluated_get(depsgraph).data
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    fingerprint = f"{len(mesh.vertices)}:{len(mesh.polygons)}:{float(co.sum()):.6f}:{float(np.abs(co).sum()):.6f}"
+
+    key = obj.name_full
+    cached = _SURFACE_BVH_CACHE.get(key)
+    if cached and cached[0] == fingerprint:
+        return cached[1], fingerprint
+
+    tree = BVHTree.FromObject(obj, depsgraph)
+    _SURFACE_BVH_CACHE[key] = (fingerprint, tree)
+    return tree, fingerprint
+
+def prune_surface_bvh_cache(surfaces):
+    """删除不属于当前投射表面的缓存BVH，避免整个会话累积"""
+    keep = {obj.name_full for obj in surfaces}
+    for key in [key for key in _SURFACE_BVH_CACHE if key not in keep]:
+        del _SURFACE_BVH_CACHE[key]
+
+def get_projection_region(scene, surfaces):
+    """投射区域 (xy_min, xy_max)：选中表面的XY包围盒，或以3D游标为中心的正方形"""
+    if scene.stone_project_region == "CURSOR":
+        center = np.array(scene.cursor.location[:2])
+        half = scene.stone_project_size * 0.5
+        return center - half, center + half
+
+    corners = []
+    for obj in surfaces:
+        matrix = np.array(obj.matrix_world)
+        local = np.array([corner[:] for corner in obj.bound_box])
+        corners.append(local @ matrix[:3, :3].T + matrix[:3, 3])
+    corners = np.concatenate(corners)
+    return corners[:, :2].min(axis=0), corners[:, :2].max(axis=0)
+
+class SurfaceProjector:
+    """
+    多表面竖直向下投影
+    - 每个表面使用缓存的对象空间BVHTree，射线起点按逆矩阵一次性批量变换
+    - 命中点/法线批量变换回世界坐标，多个表面取最高命中点
+    - 变换矩阵奇异（某个缩放轴为0）的表面无法投射，跳过并记录到 skipped
+    """
+
+    def __init__(self, surfaces, depsgraph, region_min, region_max, face_filter=None):
+        self.face_filter = face_filter
+        self.region_min = np.asarray(region_min, dtype=np.float64)
+        self.region_max = np.asarray(region_max, dtype=np.float64)
+        self.surfaces = []
+        self.fingerprints = []
+        self.skipped = []
+        z_top = -math.inf
+        prune_surface_bvh_cache(surfaces)
+        for obj in surfaces:
+            matrix = np.array(obj.matrix_world, dtype=np.float64)
+            if abs(np.linalg.det(matrix[:3, :3])) < 1e-12:
+                self.skipped.append(obj.name)
+                continue
+            tree, fingerprint = get_surface_bvh(obj, depsgraph)
+            local = np.array([corner[:] for corner in obj.bound_box])
+            z_top = max(z_top, float((local @ matrix[:3, :3].T + matrix[:3, 3])[:, 2].max()))
+            self.surfaces.append((tree, matrix, np.linalg.inv(matrix)))
+            self.fingerprints.append(f"{obj.name}:{fingerprint}:{hash(tuple(np.round(matrix, 6).ravel()))}")
+        self.z_top = z_top + 1.0
+
+    def project(self, xy):
+        """批量投射XY位置，返回 (points, normals, hit_mask)"""
+        count = len(xy)
+        origins = np.column_stack((xy, np.full(count, self.z_top)))
+        hit_z = np.full(count, -np.inf)
+        points = np.zeros((count, 3))
+        normals = np.zeros((count, 3))
+
+        for tree, matrix, inverse in self.surfaces:
+            local_origins = origins @ inverse[:3, :3].T + inverse[:3, 3]
+            local_dir = inverse[:3, :3] @ np.array((0.0, 0.0, -1.0))
+            direction = mathutils.Vector(local_dir / np.linalg.norm(local_dir))
+            ray_cast = tree.ray_cast
+
+            hit_index = []
+            hit_co = []
+            hit_no = []
+            for i, origin in enumerate(local_origins.tolist()):
+                location, normal, _face, _dist = ray_cast(origin, direction)
+                if location is not None:
+                    hit_index.append(i)
+                    hit_co.append(location[:])
+                    hit_no.append(normal[:])
+            if not hit_index:
+                continue
+
+            index = np.array(hit_index)
+            world_co = np.array(hit_co) @ matrix[:3, :3].T + matrix[:3, 3]
+            # 法线矩阵为逆矩阵的转置
+            world_no = np.array(hit_no) @ inverse[:3, :3]
+            higher = world_co[:, 2] > hit_z[index]
+            index = index[higher]
+            hit_z[index] = world_co[higher, 2]
+            points[index] = world_co[higher]
+            normals[index] = world_no[higher]
+
+        hit = np.isfinite(hit_z)
+        normals[hit] /= np.maximum(np.linalg.norm(normals[hit], axis=1), 1e-12)[:, None]
+        # 背面命中时翻转法线，保证石块朝上
+        normals[normals[:, 2] < 0.0] *= -1.0
+        # 命中点按坡度/高度/朝向过滤（与面采样模式相同的掩码）
+        if self.face_filter is not None:
+            hit &= compute_face_filter_mask(self.face_filter, points, normals)
+        return points, normals, hit
+
+def iter_projected_points(projector, count, rng, existing=None, radii=None, attempts_per_stone=30):
+    """
+    在投射区域内XY均匀采样并竖直投影到表面，生成器
+    - 未命中任何表面的射线直接丢弃
+    - radii给定时第i个石块按排斥半径radii[i]过滤（空间哈希 O(1) 检测）
+    - existing 为已放置的 (points, normals)，只追加新点
+    - 每批射线按 STONE_SAMPLE_CHUNK 条分块投射，每块之后让出一次已放置的总点数；
+      逐块按顺序过滤，结果与整批投射相同
+    结束时返回新增点的 (points, normals, rejected)
+    """
+    placed = 0
+    if existing is not None and len(existing[0]):
+        placed = len(existing[0])
+    grid = None
+    if radii is not None:
+        grid = create_radius_grid(radii, existing[0] if placed else np.empty((0, 3)))
+
+    accepted_points = []
+    accepted_normals = []
+    rejected = 0
+    needed = count - placed
+    budget = max(needed, 0) * attempts_per_stone
+    extent = projector.region_max - projector.region_min
+
+    while len(accepted_points) < needed and budget > 0:
+        batch = min(max(needed * 2, 1024), budget)
+        budget -= batch
+        xy = projector.region_min + rng.random((batch, 2)) * extent
+        for start in range(0, batch, STONE_SAMPLE_CHUNK):
+            points, normals, hit = projector.project(xy[start:start + STONE_SAMPLE_CHUNK])
+            for point, normal in zip(points[hit].tolist(), normals[hit]):
+                if grid is not None:
+                    radius = radii[placed + len(accepted_points)]
+                    if not grid.is_free(point, radius):
+                        rejected += 1
+                        continue
+                    grid.insert(point, radius)
+                accepted_points.append(point)
+                accepted_normals.append(normal)
+                if len(accepted_points) >= needed:
+                    break
+            if len(accepted_points) >= needed:
+                break
+            yield placed + len(accepted_points)
+
+    return (
+        np.array(accepted_points, dtype=np.float64).reshape(-1, 3),
+        np.array(accepted_normals, dtype=np.float64).reshape(-1, 3),
+        rejected,
+    )
+
+def run_sampler(sampler):
+    """同步运行采样生成器直到结束，返回其结果（分帧生成则在计时器事件间逐步推进）"""
+    while True:
+        try:
+            next(sampler)
+        except StopIteration as stop:
+            return stop.value
+
+def draw_stone_variation(scene, count, variant_count):
+    """
+    按种子派生每个石块的随机旋转角、缩放、灰度和形状变体索引
+    - 随机数按行一次性生成（前缀稳定）：数量变化时已有石块的随机量不变，
+      仅修改缩放/颜色范围时石块按同一随机量原地更新
+    """
+    u = np.random.default_rng([scene.stone_seed, STONE_STREAM_VARIATION]).random((count, 4))
+    spins = u[:, 0] * (math.pi * 2)
+    scales = scene.stone_scale_min + u[:, 1] * (scene.stone_scale_max - scene.stone_scale_min)
+    grays = scene.stone_color_min + u[:, 2] * (scene.stone_color_max - scene.stone_color_min)
+    variant_index = np.minimum((u[:, 3] * variant_count).astype(np.int64), variant_count - 1)
+    return spins, scales, grays, variant_index
+
+def compute_stone_matrices(points, normals, spins, scales):
+    """
+    批量计算石块世界矩阵 (N, 4, 4)
+    - Z轴对齐法线（无分支正交基），再绕自身Z轴旋转spin，最后等比缩放
+    """
+    nx, ny, nz = normals[:, 0], normals[:, 1], normals[:, 2]
+    sign = np.where(nz >= 0.0, 1.0, -1.0)
+    a = -1.0 / (sign + nz)
+    b = nx * ny * a
+    tangent = np.column_stack((1.0 + sign * nx * nx * a, sign * b, -sign * nx))
+    bitangent = np.column_stack((b, sign + ny * ny * a, -ny))
+
+    cos_spin = np.cos(spins)[:, None]
+    sin_spin = np.sin(spins)[:, None]
+    scales = scales[:, None]
+
+    matrices = np.zeros((len(points), 4, 4))
+    matrices[:, :3, 0] = (cos_spin * tangent + sin_spin * bitangent) * scales
+    matrices[:, :3, 1] = (cos_spin * bitangent - sin_spin * tangent) * scales
+    matrices[:, :3, 2] = normals * scales
+    matrices[:, :3, 3] = points
+    matrices[:, 3, 3] = 1.0
+    return matrices
+
+def make_unique_names(prefix, count):
+    """预先计算count个未被占用的对象名称（仅读取一次现有名称）"""
+    existing = set(bpy.data.objects.keys())
+    names = []
+    index = 0
+    while len(names) < count:
+        name = f"{prefix}{index}"
+        if name not in existing:
+            names.append(name)
+        index += 1
+    return names
+
+def copy_variant_mesh(mesh):
+    """
+    独立复制用的变体网格副本
+    - 副本不继承 stone_variant_key（该键只标记库中的变体网格），改记 stone_copy_of 供形状变化比对
+    """
+    copy = mesh.copy()
+    key = copy.pop("stone_variant_key", None)
+    copy["stone_copy_of"] = key or ""
+    return copy
+
+def replace_stone_mesh(obj, mesh, free_old=True):
+    """
+    替换石块对象的网格，旧网格失去全部用户时立即删除（变体网格由库对象持有，不会被删）
+    - free_old=False 时保留旧网格（分帧生成取消时需要恢复，提交时再删除）
+    """
+    old_mesh = obj.data
+    obj.data = mesh
+    if free_old and old_mesh.users == 0:
+        bpy.data.meshes.remove(old_mesh)
+
+def build_stone_objects(collection, variants, copy_mode, names, matrices, grays, variant_index, indices):
+    """
+    批量创建序号为indices的石块对象并链接到生成集合
+    - 新建集合尚未挂到场景时链接，避免每个对象触发视图层同步
+    - 名称来自预先计算的唯一序列，无需逐个重命名
+    返回新建的对象列表（分帧生成取消时用于回滚）
+    """
+    variant_meshes = [variant.data for variant in variants]
+    new_object = bpy.data.objects.new
+    link = collection.objects.link
+    created = []
+
+    for name, index in zip(names, indices):
+        k = int(variant_index[index])
+        mesh = variant_meshes[k]
+        # 独立复制：仅复制网格，材质仍共享
+        if copy_mode == "INDEPENDENT":
+            mesh = copy_variant_mesh(mesh)
+
+        obj = new_object(name, mesh)
+        obj.matrix_world = mathutils.Matrix(matrices[index].tolist())
+        # 灰度写入对象自定义属性，由共享材质读取
+        obj["stone_gray"] = float(grays[index])
+        obj["stone_index"] = index
+        obj["stone_variant"] = k
+        link(obj)
+        created.append(obj)
+    return created
+
+def plan_stone_sync(collection, count):
+    """
+    按石块序号比对生成集合中的石块对象，未带生成标记的对象不做处理
+    返回 (existing, stale, missing)：可复用的 {序号: 对象}、需删除的对象、需新建的序号列表
+    """
+    existing = {}
+    stale = []
+    for obj in collection.objects:
+        if obj.get("stone_instancer"):
+            stale.append(obj)
+            continue
+        index = obj.get("stone_index")
+        if index is None:
+            continue
+        if index >= count or index in existing or obj.type != 'MESH':
+            stale.append(obj)
+        else:
+            existing[index] = obj
+    missing = [index for index in range(count) if index not in existing]
+    return existing, stale, missing
+
+def repose_stone_objects(variants, copy_mode, matrices, grays, variant_index, existing, undo=None):
+    """
+    已有序号的石块对象原地重设变换、灰度（变体或复制模式变化时替换网格）
+    - undo 为列表时逐个记录 (对象, 原矩阵, 原灰度, 原变体, 原网格)，被替换的旧网格暂不删除
+    """
+    variant_meshes = [variant.data for variant in variants]
+    free_old = undo is None
+    for index, obj in existing.items():
+        if undo is not None:
+            undo.append((obj, obj.matrix_world.copy(), obj.get("stone_gray"), obj.get("stone_variant"), obj.data))
+        k = int(variant_index[index])
+        variant_mesh = variant_meshes[k]
+        if copy_mode == "LINKED":
+            if obj.data != variant_mesh:
+                replace_stone_mesh(obj, variant_mesh, free_old)
+        elif obj.data == variant_mesh or obj.get("stone_variant") != k \
+                or obj.data.get("stone_copy_of") != variant_mesh.get("stone_variant_key"):
+            # 独立复制：形状变化或仍共享变体网格时重新复制
+            replace_stone_mesh(obj, copy_variant_mesh(variant_mesh), free_old)
+        obj.matrix_world = mathutils.Matrix(matrices[index].tolist())
+        obj["stone_gray"] = float(grays[index])
+        obj["stone_variant"] = k
+
+def restore_stone_objects(undo):
+    """按 repose_stone_objects 的记录逆序恢复石块对象，恢复后失去用户的网格副本一并删除"""
+    replaced = []
+    for obj, matrix, gray, variant, mesh in reversed(undo):
+        if obj.data != mesh:
+            replaced.append(obj.data)
+            obj.data = mesh
+        obj.matrix_world = matrix
+        obj["stone_gray"] = gray
+        obj["stone_variant"] = variant
+    orphans = [mesh for mesh in set(replaced) if mesh.users == 0]
+    if orphans:
+        bpy.data.batch_remove(orphans)
+
+def sync_stone_objects(collection, variants, copy_mode, matrices, grays, variant_index):
+    """
+    按石块序号同步生成集合中的石块对象
+    - 已有序号的对象原地重设变换、灰度（必要时替换网格）
+    - 仅在数量变化时新增/删除差额对象
+    返回 (reused, added, removed)
+    """
+    existing, stale, missing = plan_stone_sync(collection, len(matrices))
+    remove_objects(stale)
+    repose_stone_objects(variants, copy_mode, matrices, grays, variant_index, existing)
+    if missing:
+        names = make_unique_names(STONE_NAME_PREFIX, len(missing))
+        build_stone_objects(collection, variants, copy_mode, names, matrices, grays, variant_index, missing)
+
+    return len(existing), len(missing), len(stale)
+
+def is_generated_stone(obj):
+    """是否为石块生成器创建的对象（石块或实例对象），不作为分布表面"""
+    return obj.get("stone_index") is not None or bool(obj.get("stone_instancer"))
+
+def get_state_surfaces(collection):
+    """读取生成集合记录的分布表面（当前选择已变为石块时回退使用）"""
+    names = collection.get("stone_surfaces", "")
+    surfaces = [bpy.data.objects.get(name) for name in names.split("\n") if name]
+    return [obj for obj in surfaces if obj and obj.type == 'MESH']
+
+def get_spacing_key_parts(scene):
+    """间距过滤相关的布局键片段：排斥半径或重试预算变化时需重新采样"""
+    if scene.stone_sampling == "POISSON":
+        return [f"{get_poisson_spacing(scene):.6f}", str(scene.stone_overlap_retries)]
+    if scene.stone_sampling == "NO_OVERLAP":
+        return [
+            f"{scene.stone_base_size:.6f}",
+            f"{scene.stone_scale_min:.6f}",
+            f"{scene.stone_scale_max:.6f}",
+            str(scene.stone_overlap_retries),
+        ]
+    return []
+
+def get_stone_layout_key(scene, surface, face_data):
+    """
+    布局缓存键：分布来源、采样方式、种子及分布表面的几何指纹
+    - 键不变时复用已存储的采样面索引和重心坐标，只重设变换
+    """
+    parts = [
+        scene.stone_dist_mode,
+        surface.name,
+        scene.stone_sampling,
+        str(scene.stone_seed),
+        str(len(face_data["areas"])),
+        f"{face_data['cumulative_area'][-1]:.6f}",
+        f"{face_data['tri_co'].sum():.6f}",
+        face_data["density_key"],
+    ]
+    parts.extend(get_spacing_key_parts(scene))
+    return "|".join(parts)
+
+def get_projection_layout_key(scene, projector):
+    """投影模式布局缓存键：区域、采样方式、种子及每个表面的几何/变换指纹"""
+    parts = [
+        scene.stone_dist_mode,
+        scene.stone_sampling,
+        str(scene.stone_seed),
+        f"{projector.region_min[0]:.6f},{projector.region_min[1]:.6f}",
+        f"{projector.region_max[0]:.6f},{projector.region_max[1]:.6f}",
+        get_face_filter_key(projector.face_filter),
+    ] + projector.fingerprints
+    parts.extend(get_spacing_key_parts(scene))
+    return "|".join(parts)
+
+def pack_state_array(values, dtype):
+    """数组按指定类型压缩为base64字符串（float32/int32 原始字节），存储到生成集合"""
+    return base64.b64encode(np.ascontiguousarray(values, dtype=dtype).tobytes()).decode("ascii")
+
+def unpack_state_array(value, dtype):
+    """pack_state_array 的逆操作（兼容旧版本存储的列表属性）"""
+    if isinstance(value, str):
+        return np.frombuffer(base64.b64decode(value), dtype=dtype)
+    return np.array(value, dtype=dtype)
+
+def read_scatter_state(collection, layout_key):
+    """
+    读取生成集合上存储的散布状态，布局键不一致时返回None
+    - 面采样模式返回 (tri_index, bary, requested)；投影模式返回 (points, normals, requested)
+    - requested 为产生该状态时请求的石块数（旧版本未存储时取已放置数）
+    """
+    if collection.get("stone_layout_key") != layout_key:
+        return None
+    if "stone_hits" in collection:
+        hits = unpack_state_array(collection["stone_hits"], np.float32).astype(np.float64).reshape(-1, 6)
+        return hits[:, :3], hits[:, 3:], collection.get("stone_state_requested", len(hits))
+    if "stone_tri_index" in collection:
+        tri_index = unpack_state_array(collection["stone_tri_index"], np.int32).astype(np.int64)
+        bary_uv = unpack_state_array(collection["stone_bary"], np.float32).astype(np.float64).reshape(-1, 2)
+        bary = np.column_stack((1.0 - bary_uv.sum(axis=1), bary_uv))
+        return tri_index, bary, collection.get("stone_state_requested", len(tri_index))
+    return None
+
+def write_scatter_state(collection, layout_key, surfaces, requested, tri_index=None, bary=None, hits=None):
+    """
+    将布局键、分布表面及采样结果存储到生成集合
+    - 面采样模式存储采样面索引和重心坐标；投影模式存储命中点和法线
+    - requested 为请求的石块数：已放置数少于它时表示该布局在此数量下已用尽候选预算
+    - 以 float32/int32 原始字节的base64字符串存储（每个石块 12~24 字节）
+    - 布局键、表面、石块数量与请求数量均未变化时，存储内容必然相同，直接跳过
+    """
+    surface_names = "\n".join(obj.name for obj in surfaces)
+    count = len(hits[0]) if hits is not None else len(tri_index)
+    if collection.get("stone_layout_key") == layout_key and collection.get("stone_surfaces") == surface_names \
+            and collection.get("stone_state_count") == count and collection.get("stone_state_requested") == requested:
+        return
+
+    collection["stone_layout_key"] = layout_key
+    collection["stone_surfaces"] = surface_names
+    collection["stone_state_count"] = count
+    collection["stone_state_requested"] = requested
+    for key in ("stone_tri_index", "stone_bary", "stone_hits"):
+        if key in collection:
+            del collection[key]
+    if hits is not None:
+        collection["stone_hits"] = pack_state_array(np.hstack(hits), np.float32)
+    else:
+        collection["stone_tri_index"] = pack_state_array(tri_index, np.int32)
+        collection["stone_bary"] = pack_state_array(bary[:, 1:], np.float32)
+
+class StageTimer:
+    """按阶段记录耗时，用于生成结果报告"""
+
+    def __init__(self):
+        self.stages = []
+        self._last = time.perf_counter()
+
+    def lap(self, name):
+        now = time.perf_counter()
+        self.stages.append((name, now - self._last))
+        self._last = now
+
+    def total(self):
+        return sum(seconds for _name, seconds in self.stages)
+
+    def summary(self):
+        return ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.stages)
+
+# ==================== 几何节点实例模式（单对象承载全部石块）====================
+def get_stone_instance_node_group(variants):
+    """
+    获取/创建 Instance on Points 节点组（每次运行按当前变体库重建节点）
+    - 每个变体：Object Info → Geometry to Instance，按stone_variant挑选实例
+    - 点属性：stone_normal（对齐法线）、stone_spin（绕Z随机旋转）、stone_scale（缩放）
+    - stone_gray 随点属性自动传递到实例域，供材质读取
+    """
+    node_group = bpy.data.node_groups.get(STONE_INSTANCER_GROUP)
+    if node_group is None:
+        node_group = bpy.data.node_groups.new(STONE_INSTANCER_GROUP, 'GeometryNodeTree')
+        node_group.interface.new_socket(name="Geometry", in_out='INPUT', socket_type='NodeSocketGeometry')
+        node_group.interface.new_socket(name="Geometry", in_out='OUTPUT', socket_type='NodeSocketGeometry')
+    nodes = node_group.nodes
+    links = node_group.links
+    nodes.clear()
+
+    group_in = nodes.new('NodeGroupInput')
+    group_in.location = (-800, 0)
+    group_out = nodes.new('NodeGroupOutput')
+    group_out.location = (400, 0)
+
+    # 石块变体几何（已带共享材质），按顺序转为实例列表
+    to_instance = nodes.new('GeometryNodeGeometryToInstance')
+    to_instance.location = (-200, -200)
+    for k, variant in enumerate(variants):
+        object_info = nodes.new('GeometryNodeObjectInfo')
+        object_info.transform_space = 'ORIGINAL'
+        object_info.inputs['Object'].default_value = variant
+        object_info.location = (-550, -200 - k * 200)
+        links.new(object_info.outputs['Geometry'], to_instance.inputs['Geometry'])
+
+    # 读取点属性
+    def named_attribute(name, data_type, y):
+        node = nodes.new('GeometryNodeInputNamedAttribute')
+        node.data_type = data_type
+        node.inputs['Name'].default_value = name
+        node.location = (-1100, y)
+        return node.outputs['Attribute']
+
+    variant_attr = named_attribute("stone_variant", 'INT', 200)
+    normal_attr = named_attribute("stone_normal", 'FLOAT_VECTOR', 400)
+    spin_attr = named_attribute("stone_spin", 'FLOAT', 550)
+    scale_attr = named_attribute("stone_scale", 'FLOAT', 700)
+
+    # 旋转：Z轴对齐法线，再绕自身Z轴旋转stone_spin
+    align = nodes.new('FunctionNodeAlignRotationToVector')
+    align.axis = 'Z'
+    align.location = (-800, 400)
+    links.new(normal_attr, align.inputs['Vector'])
+    spin_xyz = nodes.new('ShaderNodeCombineXYZ')
+    spin_xyz.location = (-800, 550)
+    links.new(spin_attr, spin_xyz.inputs['Z'])
+    spin_rot = nodes.new('FunctionNodeEulerToRotation')
+    spin_rot.location = (-600, 550)
+    links.new(spin_xyz.outputs['Vector'], spin_rot.inputs['Euler'])
+    rotate = nodes.new('FunctionNodeRotateRotation')
+    rotate.rotation_space = 'LOCAL'
+    rotate.location = (-400, 400)
+    links.new(align.outputs['Rotation'], rotate.inputs['Rotation'])
+    links.new(spin_rot.outputs['Rotation'], rotate.inputs['Rotate By'])
+
+    instance = nodes.new('GeometryNodeInstanceOnPoints')
+    instance.location = (100, 0)
+    instance.inputs['Pick Instance'].default_value = True
+    links.new(group_in.outputs[0], instance.inputs['Points'])
+    links.new(to_instance.outputs['Instances'], instance.inputs['Instance'])
+    links.new(variant_attr, instance.inputs['Instance Index'])
+    links.new(rotate.outputs['Rotation'], instance.inputs['Rotation'])
+    links.new(scale_attr, instance.inputs['Scale'])
+    links.new(instance.outputs['Instances'], group_out.inputs[0])
+    return node_group
+
+def create_stone_instancer(collection, variants, points, normals, spins, scales, grays, variant_index):
+    """
+    将所有采样点写入单个点云网格（属性：法线/旋转/缩放/灰度），
+    并挂载几何节点修改器实例化石块
+    - 实例对象位于生成集合中，重复运行时仅替换点云数据
+    """
+    count = len(points)
+    mesh = bpy.data.meshes.new("Stone_Instance_Points")
+    mesh.vertices.add(count)
+    mesh.vertices.foreach_set("co", points.astype(np.float32).ravel())
+    for name, data_type, key, values in (
+        ("stone_normal", 'FLOAT_VECTOR', "vector", normals),
+        ("stone_spin", 'FLOAT', "value", spins),
+        ("stone_scale", 'FLOAT', "value", scales),
+        ("stone_gray", 'FLOAT', "value", grays),
+        ("stone_variant", 'INT', "value", variant_index),
+    ):
+        attr = mesh.attributes.new(name=name, type=data_type, domain='POINT')
+        dtype = np.int32 if data_type == 'INT' else np.float32
+        attr.data.foreach_set(key, values.astype(dtype).ravel())
+    mesh.update()
+
+    # 复用已有实例对象，仅替换点云数据；移除逐对象模式遗留的石块
+    instancer = None
+    stale = []
+    for obj in collection.objects:
+        if obj.get("stone_instancer") and obj.type == 'MESH' and instancer is None:
+            instancer = obj
+        elif obj.get("stone_instancer") or obj.get("stone_index") is not None:
+            stale.append(obj)
+    remove_objects(stale)
+
+    if instancer:
+        old_mesh = instancer.data
+        instancer.data = mesh
+        if old_mesh.users == 0:
+            bpy.data.meshes.remove(old_mesh)
+    else:
+        instancer = bpy.data.objects.new(STONE_INSTANCER_NAME, mesh)
+        instancer["stone_instancer"] = True
+        collection.objects.link(instancer)
+
+    modifier = instancer.modifiers.get("Stone_Instancer")
+    if modifier is None:
+        modifier = instancer.modifiers.new(name="Stone_Instancer", type='NODES')
+    modifier.node_group = get_stone_instance_node_group(variants)
+    return instancer
+
+# ==================== 3. 核心算子（基于面的随机点）====================
+def prepare_stone_scatter(operator, context, timer):
+    """
+    石块生成的准备阶段（两个生成算子共用）：分布表面、变体库与采样生成器
+    - 出错时通过operator报告并返回None
+    - 耗时的采样（间距过滤、投影射线检测）不在此执行，计划中的 sampler 由调用方推进，
+      结束后交给 apply_stone_samples
+    返回生成计划字典，供同步/分帧创建对象阶段使用
+    """
+    scene = context.scene
+    dist_mode = scene.stone_dist_mode
+    copy_mode = scene.stone_copy_mode
+    stone_count = scene.stone_count
     
-    face_data_list = []
-    # 使用bmesh获取面数据
-    bm = bmesh.new()
-    bm.from_mesh(obj.data)
-    bm.transform(obj.matrix_world)  # 转换到世界坐标
-    
-    for face in bm.faces:
-        # 面中心点
-        face_center = face.calc_center_median()
-        # 面法向量
-        face_normal = face.normal.normalized()
-        # 面的边界范围
-        verts = [v.co for v in face.verts]
-        min_x = min(v.x for v in verts)
-        max_x = max(v.x for v in verts)
-        min_y = min(v.y for v in verts)
-        max_y = max(v.y for v in verts)
-        min_z = min(v.z for v in verts)
-        max_z = max(v.z for v in verts)
-        
-        face_data_list.append({
-            "center": face_center,
-            "normal": face_normal,
-            "min_x": min_x,
-            "max_x": max_x,
-            "min_y": min_y,
-            "max_y": max_y,
-            "min_z": min_z,
-            "max_z": max_z,
-            "verts": verts
-        })
+    if copy_mode != "INSTANCED" and stone_count > MAX_OBJECT_STONES:
+        operator.report({'ERROR'}, _("Object copy modes support at most {max} stones, use Geometry Nodes Instances for more!").format(max=MAX_OBJECT_STONES))
+        return None
     
-    bm.free()
-    return face_data_list
-
-def get_random_point_on_face(face_data, scene):
-    """在单个面内生成随机点"""
-    # 方法1：三角形面（三点插值）
-    if len(face_data["verts"]) == 3:
-        v1, v2, v3 = face_data["verts"]
-        # 生成两个随机权重（0-1）
-        u = random.uniform(0, 1)
-        v = random.uniform(0, 1 - u)
-        w = 1 - u - v
-        # 插值计算随机点
-        rand_point = (u * v1) + (v * v2) + (w * v3)
-    
-    # 方法2：四边形/更多边面（边界内随机）
+    # 初始化变量
+    variants = None
+    face_data = None
+    surface = None
+    surfaces = None
+    projector = None
+    distribution_plane = None
+    
+    # 生成集合（记录了上次的分布表面，选择已变为石块时回退使用）
+    collection, new_collection = get_generated_collection(scene, "STONE")
+    
+    # -------------------------- 模式1：自动创建平面（已存在则复用）--------------------------
+    if dist_mode == "1":
+        # 创建分布平面（细分增加面数）
+        distribution_plane = create_distribution_plane(scene)
+        surface = distribution_plane
+        # 获取平面的所有面数据
+        face_data = get_object_faces_data(distribution_plane)
+        if face_data is None:
+            operator.report({'ERROR'}, _("Failed to get face data from auto-created plane!"))
+            return None
+    
+    # -------------------------- 模式2：选中对象 --------------------------
+    elif dist_mode == "2":
+        # 检查是否选中有效对象（活动对象是生成的石块时沿用上次的分布表面）
+        target_obj = context.active_object
+        if not target_obj or target_obj.type != 'MESH' or is_generated_stone(target_obj):
+            recorded = get_state_surfaces(collection)
+            target_obj = recorded[0] if recorded else None
+        if target_obj is None:
+            operator.report({'ERROR'}, _("Please select a mesh object first!"))
+            return None
+        surface = target_obj
+    
+        # 获取选中对象的所有面数据
+        face_data = get_object_faces_data(target_obj)
+        if face_data is None:
+            operator.report({'ERROR'}, _("Selected object has no faces!"))
+            return None
+    
+    # -------------------------- 模式3：投影到所有选中表面（BVH射线检测）--------------------------
+    elif dist_mode == "3":
+        surfaces = [obj for obj in context.selected_objects if obj.type == 'MESH' and not is_generated_stone(obj)]
+        if not surfaces:
+            surfaces = get_state_surfaces(collection)
+        if not surfaces:
+            operator.report({'ERROR'}, _("Please select at least one mesh surface!"))
+            return None
+        region_min, region_max = get_projection_region(scene, surfaces)
+        projector = SurfaceProjector(
+            surfaces, context.evaluated_depsgraph_get(), region_min, region_max, face_filter=get_face_filter(scene)
+        )
+        if projector.skipped:
+            operator.report({'WARNING'}, _("Skipped surfaces with a zero scale axis: {names}").format(names=", ".join(projector.skipped)))
+        if not projector.surfaces:
+            operator.report({'ERROR'}, _("Please select at least one mesh surface!"))
+            return None
+    
+    # -------------------------- 密度图与表面过滤：与面积合并为别名表（面采样模式）--------------------------
+    if face_data is not None:
+        density = None
+        if scene.stone_density_source != "NONE":
+            density = get_triangle_density(scene, surface)
+            if density is None:
+                operator.report({'WARNING'}, _("Density source not found on {name}, using uniform density").format(name=surface.name))
+    
+        # 被过滤的面权重为0，不进入别名表，采样时零额外开销
+        face_filter = get_face_filter(scene)
+        if face_filter is not None:
+            face_mask = compute_face_filter_mask(face_filter, face_data["face_centers"], face_data["face_normals"])
+            if not face_mask.any():
+                operator.report({'ERROR'}, _("No faces pass the slope / altitude / facing filters!"))
+                return None
+            density = face_mask.astype(np.float64) if density is None else density * face_mask
+    
+        if density is not None and not apply_triangle_density(face_data, density):
+            operator.report({'WARNING'}, _("Density is zero everywhere on {name}, using uniform density").format(name=surface.name))
+    
+    timer.lap("faces")
+    
+    # -------------------------- 石块变体库（形状参数不变时直接复用）--------------------------
+    variants = get_stone_library(scene)
+    timer.lap("stone")
+    
+    # -------------------------- 采样：生成器，由调用方同步运行或在计时器事件间推进 --------------------------
+    sampler = iter_scatter_samples(scene, collection, stone_count, surface, face_data, projector, surfaces)
+    
+    return {
+        "collection": collection,
+        "new_collection": new_collection,
+        "distribution_plane": distribution_plane,
+        "variants": variants,
+        "copy_mode": copy_mode,
+        "count": stone_count,
+        "sampler": sampler,
+    }
+
+def iter_scatter_samples(scene, collection, stone_count, surface, face_data, projector, surfaces):
+    """
+    石块位置采样（生成器）：布局不变时复用，数量变化时只截断/追加
+    - 间距过滤与投影射线检测分块进行，每块让出一次已放置的石块数
+    - 上次在不小于当前数量的请求下已用尽候选预算（饱和）时不再重新采样，只复用已放置的点
+    - 不写入生成集合：散布状态随结果返回，由调用方在提交时写入（分帧生成取消时保持上次状态）
+    结束时返回 (points, normals, rejected, state)，state 为 write_scatter_state 的关键字参数
+    """
+    radii = get_stone_radii(scene, stone_count)
+    retries = scene.stone_overlap_retries
+    rejected = 0
+    if projector is not None:
+        layout_key = get_projection_layout_key(scene, projector)
+        state = read_scatter_state(collection, layout_key)
+        if state is not None:
+            points, normals, requested = state[0][:stone_count], state[1][:stone_count], state[2]
+        else:
+            points = np.empty((0, 3), dtype=np.float64)
+            normals = np.empty((0, 3), dtype=np.float64)
+            requested = 0
+    
+        if len(points) < stone_count and requested < stone_count:
+            rng = np.random.default_rng([scene.stone_seed, STONE_STREAM_PROJECT, len(points)])
+            new_points, new_normals, rejected = yield from iter_projected_points(
+                projector, stone_count, rng, existing=(points, normals), radii=radii, attempts_per_stone=retries
+            )
+            points = np.concatenate((points, new_points))
+            normals = np.concatenate((normals, new_normals))
+        placed = len(points)
+        state = {"layout_key": layout_key, "surfaces": surfaces, "hits": (points, normals)}
     else:
-        rand_x = random.uniform(face_data["min_x"], face_data["max_x"])
-        rand_y = random.uniform(face_data["min_y"], face_data["max_y"])
-        # 计算Z值（基于面的平面方程）
-        a, b, c = face_data["normal"]
-        d = a * face_data["center"].x + b * face_data["center"].y + c * face_data["center"].z
-        rand_z = (d - a * rand_x - b * rand_y) / c if c != 0 else random.uniform(face_data["min_z"], face_data["max_z"])
-        rand_point = mathutils.Vector((rand_x, rand_y, rand_z))
-    
-    # 添加高度偏移（沿法向量方向）
-    final_point = rand_point + (face_data["normal"] * scene.stone_height_offset)
-    
-    return final_point
-
-def copy_stone(auto_stone, copy_mode):
-    """复制石块（关联/独立）"""
-    new_stone = auto_stone.copy()
-    new_stone.animation_data_clear()
-    
-    if copy_mode == "LINKED":
-        new_stone.data = auto_stone.data
-    elif copy_mode == "INDEPENDENT":
-        new_stone.data = auto_stone.data.copy()
-    
-    return new_stone
-
-def transform_stone(obj, scene, face_data_list):
-    """变换石块到随机面的随机点"""
-    if not face_data_list:
-        return
+        layout_key = get_stone_layout_key(scene, surface, face_data)
+        state = read_scatter_state(collection, layout_key)
+        if state is not None:
+            tri_index, bary, requested = state[0][:stone_count], state[1][:stone_count], state[2]
+        else:
+            tri_index = np.empty(0, dtype=np.int64)
+            bary = np.empty((0, 3), dtype=np.float64)
+            requested = 0
     
-    # 1. 随机选一个面
-    random_face = random.choice(face_data_list)
-    # 2. 在选中面内生成随机点
-    obj.location = get_random_point_on_face(random_face, scene)
-    
-    # 3. 旋转：对齐面法线 + 随机旋转
-    # 基础旋转（对齐法向量）
-    default_z = mathutils.Vector((0, 0, 1))
-    base_rotation = default_z.rotation_difference(random_face["normal"])
-    obj.rotation_euler = base_rotation.to_euler()
-    # 随机旋转
-    obj.rotation_euler.rotate_axis("Z", random.uniform(0, math.pi * 2))
-    
-    # 4. 随机等比缩放
-    scale = random.uniform(scene.stone_scale_min, scene.stone_scale_max)
-    obj.scale = (scale, scale, scale)
-    
-    # 5. 随机颜色（仅独立复制时生效，修复节点获取）
-    if scene.stone_copy_mode == "INDEPENDENT" and obj.data.materials:
-        mat_inst = obj.data.materials[0].copy()
-        mat_inst.name = f"Stone_Mat_{obj.name}"
-        gray = random.uniform(scene.stone_color_min, scene.stone_color_max)
-        # ✅ 修复：使用通用函数获取节点
-        bsdf = get_principled_bsdf_node(mat_inst)
-        bsdf.inputs['Base Color'].default_value = (gray, gray, gray, 1.0)
-        obj.data.materials[0] = mat_inst
+        if len(tri_index) < stone_count and requested < stone_count:
+            if radii is not None:
+                rng = np.random.default_rng([scene.stone_seed, STONE_STREAM_POISSON, len(tri_index)])
+                new_tri, new_bary, rejected = yield from iter_poisson_points_on_faces(
+                    face_data, stone_count, radii, rng, existing=(tri_index, bary), attempts_per_stone=retries
+                )
+            else:
+                rng = np.random.default_rng([scene.stone_seed, STONE_STREAM_SAMPLING])
+                new_tri, new_bary = sample_points_on_faces(face_data, stone_count, rng, start=len(tri_index))
+            tri_index = np.concatenate((tri_index, new_tri))
+            bary = np.concatenate((bary, new_bary))
+        placed = len(tri_index)
+        state = {"layout_key": layout_key, "surfaces": [surface], "tri_index": tri_index, "bary": bary}
+        points, normals = evaluate_surface_points(face_data, tri_index, bary)
+    
+    # 未放满时记录用尽预算的最大请求数，放满时记录当前数量
+    state["requested"] = stone_count if placed >= stone_count else max(stone_count, requested)
+    return points, normals, rejected, state
+
+def apply_stone_samples(operator, scene, plan, samples, timer):
+    """
+    采样结束后的处理（两个生成算子共用）：报告过滤结果、应用高度偏移、派生每个石块的随机变化
+    - samples 为 iter_scatter_samples 的返回值，结果写入生成计划
+    """
+    points, normals, rejected, state = samples
+    stone_count = plan["count"]
+    placed = len(points)
+    
+    if rejected:
+        operator.report({'INFO'}, _("Overlap check rejected {rejected} candidate positions").format(rejected=rejected))
+    if placed < stone_count:
+        if scene.stone_sampling == "POISSON":
+            operator.report({'WARNING'}, _("Minimum spacing {spacing:.2f} only fits {placed} of {count} stones").format(
+                spacing=get_poisson_spacing(scene), placed=placed, count=stone_count
+            ))
+        elif scene.stone_sampling == "NO_OVERLAP":
+            operator.report({'WARNING'}, _("Only {placed} of {count} stones fit without overlapping (retry budget exhausted)").format(
+                placed=placed, count=stone_count
+            ))
+        else:
+            operator.report({'WARNING'}, _("Only {placed} of {count} stones hit a surface in the projection region").format(
+                placed=placed, count=stone_count
+            ))
+        stone_count = placed
+    
+    # 不原地修改：投影模式的 points 同时是待写入的散布状态
+    points = points + normals * scene.stone_height_offset
+    spins, scales, grays, variant_index = draw_stone_variation(scene, stone_count, len(plan["variants"]))
+    timer.lap("sample")
+    
+    plan.update({
+        "count": stone_count,
+        "state": state,
+        "points": points,
+        "normals": normals,
+        "spins": spins,
+        "scales": scales,
+        "grays": grays,
+        "variant_index": variant_index,
+    })
+
+def finish_stone_scatter(operator, context, plan, timer, instancer=None):
+    """石块生成的收尾阶段：挂载集合、保留分布平面可见、选中并聚焦石块、报告耗时"""
+    collection = plan["collection"]
+    
+    # 全部对象就绪后一次性挂到场景
+    if plan["new_collection"]:
+        link_generated_collection(context.scene, collection)
+        timer.lap("link")
+    
+    # 保留分布平面可见（模式1）
+    distribution_plane = plan["distribution_plane"]
+    if distribution_plane:
+        distribution_plane.hide_viewport = False
+        distribution_plane.hide_render = False
+    
+    # 视图聚焦到石块（只操作生成集合；后台运行时没有3D视图则跳过）
+    if instancer:
+        select_generated_objects(context, [instancer])
+    else:
+        select_generated_objects(context, [obj for obj in collection.objects if obj.get("stone_index") is not None])
+    if context.area is not None and context.area.type == 'VIEW_3D':
+        bpy.ops.view3d.view_selected(use_all_regions=True)
+    
+    # 各阶段耗时（秒）记录到生成集合，供基准测试脚本读取
+    collection["stone_stage_timings"] = {name: seconds for name, seconds in timer.stages}
+    
+    operator.report({'INFO'}, _("Stage timings: {stages} (total {total:.0f}ms)").format(
+        stages=timer.summary(), total=timer.total() * 1000
+    ))
+    operator.report({'INFO'}, _("✅ Successfully generated {count} stones on object faces!").format(count=plan["count"]))
+
+def report_stone_sync(operator, reused, added, removed):
+    """报告逐对象模式的同步结果"""
+    operator.report({'INFO'}, _("Stones: {reused} re-posed, {added} added, {removed} removed").format(
+        reused=reused, added=added, removed=removed
+    ))
 
-# ==================== 3. 核心算子（基于面的随机点）====================
 class MESH_OT_generate_stone(bpy.types.Operator):
     bl_idname = "mesh.generate_stone"
     bl_label = _("Generate Stones")
@@ -312,75 +1685,212 @@ class MESH_OT_generate_stone(bpy.types.Operator):
     bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
-        scene = context.scene
-        dist_mode = scene.stone_dist_mode
-        copy_mode = scene.stone_copy_mode
-        stone_count = scene.stone_count
-        
-        # 初始化变量
-        auto_stone = None
-        face_data_list = []
-        distribution_plane = None
+        timer = StageTimer()
+        plan = prepare_stone_scatter(self, context, timer)
+        if plan is None:
+            return {'CANCELLED'}
+        apply_stone_samples(self, context.scene, plan, run_sampler(plan["sampler"]), timer)
+        write_scatter_state(plan["collection"], **plan["state"])
         
-        # -------------------------- 模式1：自动创建平面 --------------------------
-        if dist_mode == "1":
-            # 创建分布平面（细分增加面数）
-            distribution_plane = create_distribution_plane(scene)
-            # 获取平面的所有面数据
-            face_data_list = get_object_faces_data(distribution_plane)
-            if not face_data_list:
-                self.report({'ERROR'}, _("Failed to get face data from auto-created plane!"))
-                return {'CANCELLED'}
+        # -------------------------- 几何节点实例模式：单个点云对象 --------------------------
+        instancer = None
+        if plan["copy_mode"] == "INSTANCED":
+            instancer = create_stone_instancer(
+                plan["collection"], plan["variants"], plan["points"], plan["normals"],
+                plan["spins"], plan["scales"], plan["grays"], plan["variant_index"]
+            )
+            timer.lap("instancer")
         
-        # -------------------------- 模式2：选中对象 --------------------------
-        elif dist_mode == "2":
-            # 检查是否选中有效对象
-            target_obj = bpy.context.active_object
-            if not target_obj or target_obj.type != 'MESH':
-                self.report({'ERROR'}, _("Please select a mesh object first!"))
-                return {'CANCELLED'}
+        # -------------------------- 逐对象模式：原地重设已有石块，只增删差额 --------------------------
+        else:
+            matrices = compute_stone_matrices(plan["points"], plan["normals"], plan["spins"], plan["scales"])
+            timer.lap("transforms")
             
-            # 获取选中对象的所有面数据
-            face_data_list = get_object_faces_data(target_obj)
-            if not face_data_list:
-                self.report({'ERROR'}, _("Selected object has no faces!"))
-                return {'CANCELLED'}
+            reused, added, removed = sync_stone_objects(
+                plan["collection"], plan["variants"], plan["copy_mode"], matrices, plan["grays"], plan["variant_index"]
+            )
+            timer.lap("objects")
+            report_stone_sync(self, reused, added, removed)
+        
+        finish_stone_scatter(self, context, plan, timer, instancer)
+        return {'FINISHED'}
+
+class MESH_OT_generate_stone_modal(bpy.types.Operator):
+    """
+    分帧生成：每个计时器事件只工作 STONE_MODAL_TICK 秒，按 STONE_MODAL_STAGES 依次推进
+    - 采样 / 新建 / 重设阶段按Esc取消：删除已新建的石块并恢复已重设的石块，散布状态保持上次结果
+    - 提交阶段（写入散布状态、删除多余石块和被替换的旧网格）不可取消
+    """
+    bl_idname = "mesh.generate_stone_modal"
+    bl_label = _("Generate Stones (Time-Sliced)")
+    bl_description = _("Generate stones in small time-budgeted batches with a progress bar, press Esc to cancel and roll back")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def invoke(self, context, event):
+        self._stage_timer = StageTimer()
+        plan = prepare_stone_scatter(self, context, self._stage_timer)
+        if plan is None:
+            return {'CANCELLED'}
+        self._plan = plan
+        self._stage = "SAMPLE"
+        self._created = []
+        self._undo = []
+        self._garbage = []
+        self._cursor = 0
         
-        # -------------------------- 自动创建石块 --------------------------
-        auto_stone = create_auto_stone(scene)
+        wm = context.window_manager
+        wm.progress_begin(0, 100)
+        self._event_timer = wm.event_timer_add(STONE_MODAL_TICK, window=context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'ESC' and self._stage != "REMOVE":
+            self.cancel(context)
+            self.report({'WARNING'}, _("Stone generation cancelled, {count} partial stones removed").format(count=len(self._created)))
+            return {'CANCELLED'}
+        if event.type != 'TIMER' or event.timer != self._event_timer:
+            return {'PASS_THROUGH'}
         
-        # -------------------------- 批量生成石块 --------------------------
-        for i in range(stone_count):
-            # 复制石块（关联/独立）
-            new_stone = copy_stone(auto_stone, copy_mode)
-            scene.collection.objects.link(new_stone)
-            
-            # 变换到随机面的随机点
-            transform_stone(new_stone, scene, face_data_list)
-            new_stone.name = f"Face_Stone_{i}"
-            
-            # 进度提示
-            if i % 50 == 0:
-                self.report({'INFO'}, _("Generated {i}/{total} stones").format(i=i, total=stone_count))
+        # 每个计时器事件只工作固定时间预算，保持界面响应
+        deadline = time.perf_counter() + STONE_MODAL_TICK
+        if self._stage == "SAMPLE":
+            return self.step_sample(context, deadline)
+        if self._stage == "CREATE":
+            return self.step_create(context, deadline)
+        if self._stage == "REPOSE":
+            return self.step_repose(context, deadline)
+        return self.step_remove(context, deadline)
+
+    def update_progress(self, context, done, total):
+        """进度条按阶段平均分段，阶段内按完成比例推进"""
+        stage = STONE_MODAL_STAGES.index(self._stage)
+        fraction = min(done / total, 1.0) if total else 1.0
+        context.window_manager.progress_update(100.0 * (stage + fraction) / len(STONE_MODAL_STAGES))
+
+    def step_sample(self, context, deadline):
+        """采样阶段：推进采样生成器；结束后派生随机变化并规划对象同步（实例模式直接完成）"""
+        plan = self._plan
+        try:
+            while time.perf_counter() < deadline:
+                self.update_progress(context, next(plan["sampler"]), plan["count"])
+            return {'RUNNING_MODAL'}
+        except StopIteration as stop:
+            samples = stop.value
+        apply_stone_samples(self, context.scene, plan, samples, self._stage_timer)
         
-        # 隐藏自动创建的石块
-        auto_stone.hide_viewport = True
-        auto_stone.hide_render = True
-        # 保留分布平面可见（模式1）
-        if distribution_plane:
-            distribution_plane.hide_viewport = False
-            distribution_plane.hide_render = False
+        # 实例模式只创建一个对象，采样完成后直接提交
+        if plan["copy_mode"] == "INSTANCED":
+            write_scatter_state(plan["collection"], **plan["state"])
+            instancer = create_stone_instancer(
+                plan["collection"], plan["variants"], plan["points"], plan["normals"],
+                plan["spins"], plan["scales"], plan["grays"], plan["variant_index"]
+            )
+            self._stage_timer.lap("instancer")
+            self.end_progress(context)
+            finish_stone_scatter(self, context, plan, self._stage_timer, instancer)
+            return {'FINISHED'}
         
-        # 视图聚焦到石块
-        bpy.ops.object.select_all(action='DESELECT')
-        for obj in bpy.data.objects:
-            if obj.name.startswith("Face_Stone_"):
-                obj.select_set(True)
-        bpy.ops.view3d.view_selected(use_all_regions=True)
+        self._matrices = compute_stone_matrices(plan["points"], plan["normals"], plan["spins"], plan["scales"])
+        self._stage_timer.lap("transforms")
         
-        self.report({'INFO'}, _("✅ Successfully generated {count} stones on object faces!").format(count=stone_count))
+        # 先新建缺少的石块，再重设已有石块（记录原状态），删除多余石块留到提交阶段
+        existing, self._stale, self._missing = plan_stone_sync(plan["collection"], plan["count"])
+        self._existing = list(existing.items())
+        self._names = make_unique_names(STONE_NAME_PREFIX, len(self._missing))
+        self._stage = "CREATE"
+        self._cursor = 0
+        return {'RUNNING_MODAL'}
+
+    def step_create(self, context, deadline):
+        """新建阶段：分批创建缺少序号的石块"""
+        plan = self._plan
+        total = len(self._missing)
+        while self._cursor < total and time.perf_counter() < deadline:
+            end = min(self._cursor + STONE_MODAL_BATCH, total)
+            self._created.extend(build_stone_objects(
+                plan["collection"], plan["variants"], plan["copy_mode"], self._names[self._cursor:end],
+                self._matrices, plan["grays"], plan["variant_index"], self._missing[self._cursor:end]
+            ))
+            self._cursor = end
+        self.update_progress(context, self._cursor, total)
+        if self._cursor < total:
+            return {'RUNNING_MODAL'}
+        
+        self._stage_timer.lap("objects")
+        self._stage = "REPOSE"
+        self._cursor = 0
+        return {'RUNNING_MODAL'}
+
+    def step_repose(self, context, deadline):
+        """重设阶段：分批原地重设已有石块，被替换的旧网格暂时保留以便取消时恢复"""
+        plan = self._plan
+        total = len(self._existing)
+        while self._cursor < total and time.perf_counter() < deadline:
+            end = min(self._cursor + STONE_MODAL_BATCH, total)
+            repose_stone_objects(
+                plan["variants"], plan["copy_mode"], self._matrices, plan["grays"], plan["variant_index"],
+                dict(self._existing[self._cursor:end]), undo=self._undo
+            )
+            self._cursor = end
+        self.update_progress(context, self._cursor, total)
+        if self._cursor < total:
+            return {'RUNNING_MODAL'}
+        
+        # 提交：写入散布状态，多余石块与被替换的旧网格进入分批删除
+        self._stage_timer.lap("repose")
+        write_scatter_state(plan["collection"], **plan["state"])
+        replaced = [mesh for obj, _matrix, _gray, _variant, mesh in self._undo if obj.data != mesh]
+        self._garbage = [(obj, True) for obj in self._stale] + [(mesh, False) for mesh in set(replaced)]
+        self._stage = "REMOVE"
+        self._cursor = 0
+        return {'RUNNING_MODAL'}
+
+    def step_remove(self, context, deadline):
+        """提交阶段：分批删除多余石块及失去用户的旧网格，完成后收尾"""
+        total = len(self._garbage)
+        while self._cursor < total and time.perf_counter() < deadline:
+            end = min(self._cursor + STONE_MODAL_BATCH, total)
+            self.remove_garbage(end)
+        self.update_progress(context, self._cursor, total)
+        if self._cursor < total:
+            return {'RUNNING_MODAL'}
+        
+        self._stage_timer.lap("remove")
+        self.end_progress(context)
+        report_stone_sync(self, len(self._existing), len(self._missing), len(self._stale))
+        finish_stone_scatter(self, context, self._plan, self._stage_timer)
         return {'FINISHED'}
 
+    def remove_garbage(self, end):
+        """删除待删除列表中 [cursor, end) 部分：对象连同失去用户的数据，网格仅在无用户时删除"""
+        batch = self._garbage[self._cursor:end]
+        remove_objects([item for item, is_object in batch if is_object])
+        orphans = [item for item, is_object in batch if not is_object and item.users == 0]
+        if orphans:
+            bpy.data.batch_remove(orphans)
+        self._cursor = end
+
+    def end_progress(self, context):
+        wm = context.window_manager
+        wm.event_timer_remove(self._event_timer)
+        wm.progress_end()
+
+    def cancel(self, context):
+        """
+        Esc或窗口管理器中断时回滚：恢复已重设的石块、删除本次已创建的石块，未挂载的新集合一并删除
+        - 提交阶段已写入散布状态，中断时直接完成剩余删除
+        """
+        self.end_progress(context)
+        if self._stage == "REMOVE":
+            self.remove_garbage(len(self._garbage))
+            return
+        restore_stone_objects(self._undo)
+        remove_objects(self._created)
+        collection = self._plan["collection"]
+        if self._plan["new_collection"] and collection.users == 0:
+            bpy.data.collections.remove(collection)
+
 
 
 # ==================== 中日翻译字典（完整覆盖）====================
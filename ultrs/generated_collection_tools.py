@@ -0,0 +1,102 @@
+import bpy
+from bpy.app.translations import pgettext_iface as _
+
+# 生成器集合标记（集合自定义属性，值为生成器标识）
+GENERATOR_TAG = "lehuye_generator"
+
+# 生成器标识 → 默认集合名称
+GENERATOR_COLLECTIONS = {
+    "STONE": "Generated_Stones",
+    "MAZE": "Generated_Maze",
+}
+
+# ==================== 1. 通用工具函数 ====================
+def find_generated_collection(scene, generator):
+    """按标记在场景顶层集合中查找生成器集合（用户改名后仍可识别）"""
+    for collection in scene.collection.children:
+        if collection.get(GENERATOR_TAG) == generator:
+            return collection
+    return None
+
+def get_generated_collection(scene, generator):
+    """
+    获取/创建生成器专属集合
+    返回 (collection, is_new)：新建的集合尚未挂到场景，
+    调用方填充对象后再调用 link_generated_collection，避免逐对象视图层同步
+    """
+    collection = find_generated_collection(scene, generator)
+    if collection is not None:
+        return collection, False
+    collection = bpy.data.collections.new(GENERATOR_COLLECTIONS[generator])
+    collection[GENERATOR_TAG] = generator
+    return collection, True
+
+def link_generated_collection(scene, collection):
+    """将生成器集合挂到场景（已挂载时跳过）"""
+    if scene.collection.children.get(collection.name) is None:
+        scene.collection.children.link(collection)
+
+def remove_objects(objects):
+    """批量删除对象（bpy.data.batch_remove），并清理随之失去用户的网格/曲线数据"""
+    objects = list(objects)
+    if not objects:
+        return 0
+    datas = {obj.data for obj in objects if obj.type in {'MESH', 'CURVE'}}
+    bpy.data.batch_remove(objects)
+    orphans = [data for data in datas if data.users == 0]
+    if orphans:
+        bpy.data.batch_remove(orphans)
+    return len(objects)
+
+def clear_generated_collection(collection):
+    """
+    清空生成器集合中的所有对象（含子集合，如迷宫分块集合）及其存储的生成状态
+    - 耗时只与集合内对象数相关
+    """
+    removed = remove_objects(collection.all_objects)
+    children = list(collection.children_recursive)
+    if children:
+        bpy.data.batch_remove(children)
+    clear_generated_state(collection)
+    return removed
+
+def clear_generated_state(collection):
+    """删除集合上存储的生成状态（保留生成器标记）"""
+    for key in [key for key in collection.keys() if key != GENERATOR_TAG]:
+        del collection[key]
+
+def select_generated_objects(context, objects):
+    """
+    仅取消当前选中对象后选中生成的对象，不遍历场景中的全部对象
+    - 不改变活动对象，重复生成时分布表面仍保持为活动对象
+    """
+    for obj in context.selected_objects:
+        obj.select_set(False)
+    for obj in objects:
+        obj.select_set(True)
+
+# ==================== 2. 清除生成结果算子 ====================
+class OBJECT_OT_clear_generated(bpy.types.Operator):
+    bl_idname = "object.clear_generated"
+    bl_label = _("Clear Generated Objects")
+    bl_description = _("Delete everything the generator created (only its own collection is touched)")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    generator: bpy.props.EnumProperty(
+        name=_("Generator"),
+        items=[
+            ("STONE", _("Stone"), _("Stones created by the stone generator")),
+            ("MAZE", _("Maze"), _("Walls created by the maze generator")),
+        ],
+        default="STONE"
+    )
+
+    def execute(self, context):
+        collection = find_generated_collection(context.scene, self.generator)
+        if collection is None:
+            self.report({'WARNING'}, _("Nothing to clear!"))
+            return {'CANCELLED'}
+
+        removed = clear_generated_collection(collection)
+        self.report({'INFO'}, _("Removed {count} generated objects").format(count=removed))
+        return {'FINISHED'}